@@ -0,0 +1,150 @@
+import argparse
+import csv
+import json
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from trial_log import SessionLog
+from trial_types import DEFAULT_TRIAL_TYPES
+
+INTERFERENCE = ("ink_naming", "word_reading")
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def describe(reaction_times: List[float], correct: int, total: int) -> Dict[str, float]:
+    return {
+        "trials": total,
+        "correct": correct,
+        "accuracy": correct / total * 100 if total > 0 else 0.0,
+        "mean_rt": statistics.fmean(reaction_times) if reaction_times else 0.0,
+        "median_rt": statistics.median(reaction_times) if reaction_times else 0.0,
+        "p10_rt": percentile(reaction_times, 10),
+        "p90_rt": percentile(reaction_times, 90),
+        "sd_rt": statistics.stdev(reaction_times) if len(reaction_times) > 1 else 0.0
+    }
+
+def load_session(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        log = SessionLog(Path(path))
+        trial_types = log.metadata.get("trial_types") or list(DEFAULT_TRIAL_TYPES)
+        reaction_times: Dict[str, List[float]] = {trial_type: [] for trial_type in trial_types}
+        correct = dict.fromkeys(trial_types, 0)
+        total = dict.fromkeys(trial_types, 0)
+        for record in log.records():
+            if not 1 <= record.part <= len(trial_types):
+                continue
+            trial_type = trial_types[record.part - 1]
+            total[trial_type] += 1
+            if record.is_correct:
+                correct[trial_type] += 1
+                if 0 < record.onset_ns <= record.response_ns:
+                    reaction_times[trial_type].append((record.response_ns - record.onset_ns) / 1e9)
+    except Exception as e:
+        print(f"Warning: Skipping {path}: {e}")
+        return None
+
+    return {
+        "session": Path(path).name,
+        "seed": log.metadata.get("seed"),
+        "language": log.metadata.get("language", ""),
+        "reaction_times": reaction_times,
+        "correct": correct,
+        "total": total
+    }
+
+def session_rows(session: Dict[str, Any]) -> List[Dict[str, Any]]:
+    rows = []
+    for trial_type in session["total"]:
+        row = {"session": session["session"], "seed": session["seed"],
+               "language": session["language"], "trial_type": trial_type}
+        row.update(describe(session["reaction_times"][trial_type], session["correct"][trial_type],
+                            session["total"][trial_type]))
+        rows.append(row)
+    return rows
+
+def interference(session: Dict[str, Any]) -> Optional[float]:
+    incongruent, baseline = (session["reaction_times"].get(trial_type) for trial_type in INTERFERENCE)
+    if not incongruent or not baseline:
+        return None
+    return statistics.fmean(incongruent) - statistics.fmean(baseline)
+
+def summary_rows(sessions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    rows = []
+    trial_types = list(dict.fromkeys(trial_type for session in sessions for trial_type in session["total"]))
+    for trial_type in trial_types:
+        present = [session for session in sessions if trial_type in session["total"]]
+        pooled = [rt for session in present for rt in session["reaction_times"][trial_type]]
+        correct = sum(session["correct"][trial_type] for session in present)
+        total = sum(session["total"][trial_type] for session in present)
+        row = {"trial_type": trial_type, "sessions": len(present)}
+        row.update(describe(pooled, correct, total))
+        rows.append(row)
+
+    effects = [effect for effect in map(interference, sessions) if effect is not None]
+    rows.append({
+        "trial_type": f"interference_{INTERFERENCE[0]}_vs_{INTERFERENCE[1]}",
+        "sessions": len(effects),
+        "mean_rt": statistics.fmean(effects) if effects else 0.0,
+        "median_rt": statistics.median(effects) if effects else 0.0,
+        "sd_rt": statistics.stdev(effects) if len(effects) > 1 else 0.0
+    })
+    return rows
+
+def write_table(rows: List[Dict[str, Any]], path: Path, fmt: str) -> None:
+    columns: List[str] = []
+    for row in rows:
+        columns.extend(key for key in row if key not in columns)
+
+    if fmt == "columns":
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({column: [row.get(column) for row in rows] for column in columns}, f)
+    else:
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
+
+def collect_paths(inputs: Iterable[str]) -> List[str]:
+    paths = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            paths.extend(str(p) for p in sorted(path.glob("*.strp")))
+        else:
+            paths.append(str(path))
+    return paths
+
+def analyze(paths: List[str], workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    chunksize = max(1, len(paths) // ((workers or 4) * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [session for session in pool.map(load_session, paths, chunksize=chunksize) if session is not None]
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate Stroop Test session logs")
+    parser.add_argument("inputs", nargs="*", default=["results"], help="session files or directories")
+    parser.add_argument("--output-dir", default="analytics")
+    parser.add_argument("--format", choices=["csv", "columns"], default="csv")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    paths = collect_paths(args.inputs)
+    sessions = analyze(paths, args.workers)
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    extension = "csv" if args.format == "csv" else "json"
+
+    write_table([row for session in sessions for row in session_rows(session)],
+                output_dir / f"sessions.{extension}", args.format)
+    write_table(summary_rows(sessions), output_dir / f"summary.{extension}", args.format)
+    print(f"Analyzed {len(sessions)} of {len(paths)} sessions into {output_dir}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
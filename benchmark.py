@@ -0,0 +1,177 @@
+import os
+import time
+PROCESS_START = time.perf_counter()
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import random
+import statistics
+import tracemalloc
+from typing import Any, Dict, List, Optional
+import pygame
+from main import GameConfig, StroopTest
+IMPORTED = time.perf_counter()
+
+class SyntheticResponder:
+    def __init__(self, game: StroopTest, error_rate: float = 0.0, seed: int = 0):
+        self.game = game
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+
+    def find_button(self, group: str, text: str) -> pygame.Rect:
+        for button in self.game.buttons[group]:
+            if button.text == text:
+                return button.rect
+        raise KeyError(f"No '{text}' button in '{group}'")
+
+    def choose_target(self) -> Optional[pygame.Rect]:
+        state = self.game.state
+        if state == "menu":
+            return self.find_button("menu", "play")
+        if state == "results":
+            return self.find_button("results", "menu")
+        if state == "game":
+            correct = self.game.session.correct_color
+            if self.rng.random() < self.error_rate:
+                wrong = [b for b in self.game.buttons["color"] if b.text != correct]
+                return self.rng.choice(wrong).rect
+            return self.find_button("color", correct)
+        return None
+
+    def respond(self) -> bool:
+        rect = self.choose_target()
+        if rect is None:
+            return False
+        pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=rect.center, button=1))
+        return True
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def peak_rss_kb() -> int:
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except ImportError:
+        return 0
+
+def run_benchmark(trial_count: int = 10, width: int = 1280, height: int = 720, language: str = "english",
+                  sessions: int = 1, error_rate: float = 0.0, seed: int = 0,
+                  trace_memory: bool = False, record_trials: bool = False,
+                  results_dir: str = "results", memory_output: str = "") -> Dict[str, Any]:
+    config = GameConfig(screen_width=width, screen_height=height, display_mode="windowed",
+                        language=language, trial_count=trial_count, seed=seed,
+                        record_trials=record_trials, results_dir=results_dir,
+                        memory_tracking=bool(memory_output), memory_output=memory_output)
+    game = StroopTest(config)
+    game.countdown_duration = 0
+    responder = SyntheticResponder(game, error_rate, seed)
+
+    if trace_memory:
+        tracemalloc.start()
+
+    frame_times: List[float] = []
+    render_times: List[float] = []
+    trials = 0
+    completed = 0
+    previous_state = game.state
+    started = time.perf_counter()
+
+    while game.running and completed < sessions:
+        frame_start = time.perf_counter()
+        if responder.respond() and game.state == "game":
+            trials += 1
+        game.handle_events()
+        game.update()
+        render_start = time.perf_counter()
+        game.render()
+        frame_end = time.perf_counter()
+        render_times.append(frame_end - render_start)
+        frame_times.append(frame_end - frame_start)
+        if game.memory is not None:
+            game.memory.end_frame()
+        if game.state == "results" and previous_state != "results":
+            completed += 1
+        previous_state = game.state
+
+    elapsed = time.perf_counter() - started
+    traced_peak = 0
+    if trace_memory:
+        traced_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    game.shutdown()
+
+    return {
+        "trial_count": trial_count,
+        "resolution": [width, height],
+        "language": language,
+        "sessions": completed,
+        "frames": len(frame_times),
+        "trials": trials,
+        "elapsed_sec": elapsed,
+        "fps": len(frame_times) / elapsed if elapsed > 0 else 0.0,
+        "trials_per_sec": trials / elapsed if elapsed > 0 else 0.0,
+        "render_ms_mean": statistics.fmean(render_times) * 1000 if render_times else 0.0,
+        "render_ms_p95": percentile(render_times, 95) * 1000,
+        "render_ms_max": max(render_times, default=0.0) * 1000,
+        "frame_ms_mean": statistics.fmean(frame_times) * 1000 if frame_times else 0.0,
+        "peak_rss_kb": peak_rss_kb(),
+        "traced_peak_bytes": traced_peak
+    }
+
+def measure_startup(width: int = 1280, height: int = 720, language: str = "english") -> Dict[str, Any]:
+    config = GameConfig(screen_width=width, screen_height=height, display_mode="windowed", language=language)
+    started = time.perf_counter()
+    game = StroopTest(config)
+    constructed = time.perf_counter()
+    game.handle_events()
+    game.update()
+    game.render()
+    first_frame = time.perf_counter()
+    game.shutdown()
+    return {
+        "resolution": [width, height],
+        "language": language,
+        "import_ms": (IMPORTED - PROCESS_START) * 1000,
+        "construct_ms": (constructed - started) * 1000,
+        "first_frame_ms": (first_frame - constructed) * 1000,
+        "time_to_first_frame_ms": (first_frame - PROCESS_START) * 1000,
+        "button_groups_built": sorted(game.buttons)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Stroop Test benchmark")
+    parser.add_argument("--trial-count", type=int, default=10)
+    parser.add_argument("--resolution", default="1280x720")
+    parser.add_argument("--language", default="english")
+    parser.add_argument("--sessions", type=int, default=1)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace-memory", action="store_true")
+    parser.add_argument("--record-trials", action="store_true")
+    parser.add_argument("--results-dir", default="results")
+    parser.add_argument("--memory-report", default="", help="track allocations per state and frame into this file")
+    parser.add_argument("--startup", action="store_true", help="measure time to first frame and exit")
+    parser.add_argument("--output", default="benchmark.json")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.resolution.lower().split("x"))
+    if args.startup:
+        result = measure_startup(width, height, args.language)
+        print(json.dumps(result, indent=4))
+        return
+    result = run_benchmark(args.trial_count, width, height, args.language, args.sessions,
+                           args.error_rate, args.seed, args.trace_memory, args.record_trials,
+                           args.results_dir, args.memory_report)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=4)
+    print(json.dumps(result, indent=4))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,315 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from schedule import TrialSchedule
+
+TRIAL_COLUMNS = ("station", "session_id", "part", "word", "ink", "correct", "response", "is_correct",
+                 "reaction_time", "timestamp")
+SESSION_COLUMNS = ("station", "session_id", "seed", "language", "trial_count", "score", "correct_clicks",
+                   "incorrect_clicks", "avg_time", "timestamp")
+
+def parse_address(address: str) -> Tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+class CollectorClient:
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, max_buffer: int = 10000,
+                 batch_size: int = 200, max_backoff: float = 5.0):
+        self.host = host
+        self.port = port
+        self.batch_size = batch_size
+        self.max_backoff = max_backoff
+        self.max_buffer = max_buffer
+        self.buffer: Deque[bytes] = deque()
+        self.sent = 0
+        self.dropped = 0
+        self.running = False
+        self._wake: Optional[asyncio.Event] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_address(cls, address: str) -> 'CollectorClient':
+        host, port = parse_address(address)
+        return cls(host, port)
+
+    def submit(self, message: Dict[str, Any]) -> None:
+        if len(self.buffer) >= self.max_buffer:
+            self.buffer.popleft()
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % self.max_buffer == 0:
+                print(f"Warning: Collector buffer full, dropped {self.dropped} messages so far")
+        self.buffer.append(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+        if self._wake is not None:
+            self._wake.set()
+
+    def start(self) -> asyncio.Task:
+        self.running = True
+        self._wake = asyncio.Event()
+        self._task = asyncio.ensure_future(self._run())
+        return self._task
+
+    async def _run(self) -> None:
+        backoff = 0.1
+        while self.running or self.buffer:
+            if not self.buffer:
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+            try:
+                await self._send_batch()
+                backoff = 0.1
+            except (OSError, asyncio.TimeoutError):
+                await self._disconnect()
+                if not self.running:
+                    break
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+        await self._disconnect()
+
+    async def close(self, timeout: float = 2.0) -> None:
+        self.running = False
+        if self._task is None:
+            return
+        self._wake.set()
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            print(f"Warning: Dropping {len(self.buffer)} unsent collector messages")
+
+    async def _send_batch(self) -> None:
+        if self._writer is None:
+            _, self._writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), timeout=2.0)
+        batch = [self.buffer.popleft() for _ in range(min(self.batch_size, len(self.buffer)))]
+        try:
+            self._writer.write(b"".join(batch))
+            await asyncio.wait_for(self._writer.drain(), timeout=5.0)
+        except BaseException:
+            self.buffer.extendleft(reversed(batch))
+            raise
+        self.sent += len(batch)
+
+    async def _disconnect(self) -> None:
+        if self._writer is not None:
+            writer, self._writer = self._writer, None
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+class CollectorServer:
+    def __init__(self, db_path: str = "collector.db", batch_size: int = 500, flush_interval: float = 0.25):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.inserted = 0
+        self._trials: List[Tuple] = []
+        self._sessions: List[Tuple] = []
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="collector-db")
+        self._db = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._flusher: Optional[asyncio.Task] = None
+
+    def _open_db(self) -> None:
+        import sqlite3
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(f"CREATE TABLE IF NOT EXISTS trials ({', '.join(TRIAL_COLUMNS)})")
+        self._db.execute(f"CREATE TABLE IF NOT EXISTS sessions ({', '.join(SESSION_COLUMNS)})")
+        self._db.commit()
+
+    def _write(self, trials: List[Tuple], sessions: List[Tuple]) -> int:
+        with self._db:
+            if trials:
+                self._db.executemany(
+                    f"INSERT INTO trials VALUES ({', '.join('?' * len(TRIAL_COLUMNS))})", trials)
+            if sessions:
+                self._db.executemany(
+                    f"INSERT INTO sessions VALUES ({', '.join('?' * len(SESSION_COLUMNS))})", sessions)
+        return len(trials) + len(sessions)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._open_db)
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        self._flusher = asyncio.ensure_future(self._flush_loop())
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._flusher is not None:
+            self._flusher.cancel()
+        await self.flush()
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._db.close)
+        self._executor.shutdown()
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self._accept(line)
+                if len(self._trials) + len(self._sessions) >= self.batch_size:
+                    await self.flush()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except (ValueError, asyncio.LimitOverrunError) as e:
+            print(f"Warning: Dropping collector connection: {e}")
+        finally:
+            writer.close()
+
+    def _accept(self, line: bytes) -> None:
+        try:
+            message = json.loads(line)
+        except ValueError:
+            print(f"Warning: Dropping malformed collector message: {line[:80]!r}")
+            return
+        if not isinstance(message, dict):
+            print(f"Warning: Dropping non-object collector message: {line[:80]!r}")
+            return
+        if message.get("type") == "session":
+            self._sessions.append(tuple(message.get(column) for column in SESSION_COLUMNS))
+        else:
+            self._trials.append(tuple(message.get(column) for column in TRIAL_COLUMNS))
+
+    async def flush(self) -> None:
+        if not self._trials and not self._sessions:
+            return
+        trials, self._trials = self._trials, []
+        sessions, self._sessions = self._sessions, []
+        loop = asyncio.get_running_loop()
+        count = await loop.run_in_executor(self._executor, self._write, trials, sessions)
+        self.inserted += count
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+def synthetic_session(station: str, index: int, trial_count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    colors = ["red", "green", "blue", "yellow", "purple", "black"]
+    schedule = TrialSchedule(colors, trial_count, seed=rng.randrange(2 ** 32))
+    session_id = f"{station}-{index}"
+    messages = []
+    score = correct_clicks = incorrect_clicks = 0
+    total_time = 0.0
+    for part, plan in schedule.parts.items():
+        for i in range(trial_count):
+            is_correct = rng.random() > 0.05
+            response = plan.correct[i] if is_correct else rng.choice(colors)
+            is_correct = response == plan.correct[i]
+            reaction_time = rng.lognormvariate(-0.4 + 0.1 * part, 0.3)
+            if is_correct:
+                score += 10
+                correct_clicks += 1
+                total_time += reaction_time
+            else:
+                score -= 5
+                incorrect_clicks += 1
+            messages.append({"type": "trial", "station": station, "session_id": session_id, "part": part,
+                             "word": plan.words[i], "ink": plan.inks[i], "correct": plan.correct[i],
+                             "response": response, "is_correct": is_correct,
+                             "reaction_time": reaction_time, "timestamp": time.time()})
+    messages.append({"type": "session", "station": station, "session_id": session_id, "seed": schedule.seed,
+                     "language": "english", "trial_count": trial_count, "score": score,
+                     "correct_clicks": correct_clicks, "incorrect_clicks": incorrect_clicks,
+                     "avg_time": total_time / correct_clicks if correct_clicks else 0.0,
+                     "timestamp": time.time()})
+    return messages
+
+async def fake_station(name: str, host: str, port: int, sessions: int, trial_count: int, seed: int) -> int:
+    rng = random.Random(seed)
+    client = CollectorClient(host, port)
+    client.start()
+    for index in range(sessions):
+        for message in synthetic_session(name, index, trial_count, rng):
+            client.submit(message)
+        await asyncio.sleep(0)
+    await client.close(timeout=30.0)
+    return client.sent
+
+async def load_test(host: str, port: int, stations: int, sessions: int, trial_count: int,
+                    server: Optional[CollectorServer] = None) -> Dict[str, Any]:
+    started = time.perf_counter()
+    sent = await asyncio.gather(*(fake_station(f"station-{i}", host, port, sessions, trial_count, i)
+                                  for i in range(stations)))
+    expected = sum(sent)
+    if server is not None:
+        while server.inserted < expected:
+            await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - started
+    return {
+        "stations": stations,
+        "sessions_per_station": sessions,
+        "messages": expected,
+        "elapsed_sec": elapsed,
+        "messages_per_sec": expected / elapsed if elapsed > 0 else 0.0
+    }
+
+async def serve(host: str, port: int, db_path: str) -> None:
+    server = CollectorServer(db_path)
+    await server.start(host, port)
+    print(f"Collecting on {host}:{server.port} into {db_path}")
+    try:
+        while True:
+            await asyncio.sleep(5)
+            print(f"{server.inserted} rows stored")
+    finally:
+        await server.stop()
+
+async def load_generator(args: argparse.Namespace) -> None:
+    server = None
+    host, port = args.host, args.port
+    if args.embedded:
+        server = CollectorServer(args.db)
+        await server.start(host, 0)
+        port = server.port
+    try:
+        result = await load_test(host, port, args.stations, args.sessions, args.trial_count, server)
+    finally:
+        if server is not None:
+            await server.stop()
+    print(json.dumps(result, indent=4))
+
+def main():
+    parser = argparse.ArgumentParser(description="Stroop Test results collector")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--db", default="collector.db")
+
+    load_parser = subparsers.add_parser("loadgen")
+    load_parser.add_argument("--host", default="127.0.0.1")
+    load_parser.add_argument("--port", type=int, default=8765)
+    load_parser.add_argument("--stations", type=int, default=20)
+    load_parser.add_argument("--sessions", type=int, default=10)
+    load_parser.add_argument("--trial-count", type=int, default=10)
+    load_parser.add_argument("--embedded", action="store_true", help="start a local server and wait for ingest")
+    load_parser.add_argument("--db", default="collector.db")
+
+    args = parser.parse_args()
+    try:
+        if args.command == "serve":
+            asyncio.run(serve(args.host, args.port, args.db))
+        else:
+            asyncio.run(load_generator(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,64 @@
+import json
+import os
+import platform
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+class DebouncedJsonWriter:
+    def __init__(self, path: Path, delay: float = 0.5):
+        self.path = Path(path)
+        self.delay = delay
+        self.writes = 0
+        self._pending: Optional[Dict[str, Any]] = None
+        self._deadline = 0.0
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._threaded = platform.system() != "Emscripten"
+
+    def schedule(self, data: Dict[str, Any]) -> None:
+        if not self._threaded:
+            self._write(data)
+            return
+        with self._lock:
+            self._pending = data
+            self._deadline = time.monotonic() + self.delay
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="config-writer", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def flush(self) -> None:
+        with self._io_lock:
+            with self._lock:
+                data, self._pending = self._pending, None
+            if data is not None:
+                self._write(data)
+
+    def _worker(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            while True:
+                with self._lock:
+                    if self._pending is None:
+                        break
+                    remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
+                    continue
+                self.flush()
+                break
+
+    def _write(self, data: Dict[str, Any]) -> None:
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=4)
+            os.replace(temp_path, self.path)
+            self.writes += 1
+        except Exception as e:
+            print(f"Error saving config: {e}")
\ No newline at end of file
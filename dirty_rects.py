@@ -0,0 +1,30 @@
+from typing import Hashable, List, Optional, Set, Tuple
+import pygame
+
+class DirtyRectTracker:
+    def __init__(self):
+        self._previous: Optional[Set[Tuple[Tuple[int, int, int, int], Hashable]]] = None
+        self._current: Set[Tuple[Tuple[int, int, int, int], Hashable]] = set()
+
+    def begin_frame(self) -> None:
+        self._current = set()
+
+    def mark(self, rect: pygame.Rect, signature: Hashable) -> None:
+        self._current.add(((rect.x, rect.y, rect.w, rect.h), signature))
+
+    def invalidate(self) -> None:
+        self._previous = None
+
+    def end_frame(self) -> Optional[List[pygame.Rect]]:
+        previous, self._previous = self._previous, self._current
+        if previous is None:
+            return None
+        changed = previous.symmetric_difference(self._current)
+        return [pygame.Rect(rect) for rect in {rect for rect, _ in changed}]
+
+    def present(self) -> None:
+        rects = self.end_frame()
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
\ No newline at end of file
@@ -0,0 +1,55 @@
+import asyncio
+import time
+from typing import List
+import pygame
+
+class FrameScheduler:
+    def __init__(self, fps: int = 60, idle_poll: float = 0.01, idle_refresh: float = 1.0):
+        self.frame_time = 1.0 / fps
+        self.idle_poll = idle_poll
+        self.idle_refresh = idle_refresh
+        self._next_frame = time.perf_counter()
+        self._last_render = 0.0
+        self._render_requested = True
+        self._pending_events: List[pygame.event.Event] = []
+
+    def poll_events(self) -> List[pygame.event.Event]:
+        events = pygame.event.get()
+        if self._pending_events:
+            events = self._pending_events + events
+            self._pending_events = []
+        return events
+
+    def request_render(self) -> None:
+        self._render_requested = True
+
+    def should_render(self, active: bool, had_events: bool) -> bool:
+        now = time.perf_counter()
+        if active or had_events or self._render_requested or now - self._last_render >= self.idle_refresh:
+            self._render_requested = False
+            self._last_render = now
+            return True
+        return False
+
+    async def wait(self, active: bool) -> None:
+        if active:
+            await self._wait_frame()
+        else:
+            await self._wait_input()
+
+    async def _wait_frame(self) -> None:
+        now = time.perf_counter()
+        self._next_frame += self.frame_time
+        if self._next_frame < now - self.frame_time:
+            self._next_frame = now
+        remaining = self._next_frame - now
+        await asyncio.sleep(remaining if remaining > 0 else 0)
+
+    async def _wait_input(self) -> None:
+        while not self._render_requested and time.perf_counter() - self._last_render < self.idle_refresh:
+            events = pygame.event.get()
+            if events:
+                self._pending_events.extend(events)
+                break
+            await asyncio.sleep(self.idle_poll)
+        self._next_frame = time.perf_counter()
\ No newline at end of file
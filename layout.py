@@ -0,0 +1,71 @@
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+import pygame
+
+class SlotGrid:
+    def __init__(self, slot_count: int, screen_width: int, screen_height: int, slot_width: int,
+                 slot_height: int, spacing: int, top: float):
+        self.slot_width = slot_width
+        self.slot_height = slot_height
+        self.pitch_x = slot_width + spacing
+        self.pitch_y = slot_height + spacing
+        self.columns = max(1, min(slot_count, (screen_width + spacing) // self.pitch_x))
+        rows = -(-slot_count // self.columns) if slot_count else 0
+        self.top = int(max(0, min(top, screen_height - rows * self.pitch_y)))
+
+        self.row_starts: List[int] = []
+        self.rects: List[pygame.Rect] = []
+        for row in range(rows):
+            in_row = min(self.columns, slot_count - row * self.columns)
+            start_x = int((screen_width - (in_row * self.pitch_x - spacing)) / 2)
+            self.row_starts.append(start_x)
+            for column in range(in_row):
+                self.rects.append(pygame.Rect(start_x + column * self.pitch_x, self.top + row * self.pitch_y,
+                                              slot_width, slot_height))
+
+    def hit_test(self, pos: Tuple[int, int]) -> int:
+        x, y = pos
+        row, offset_y = divmod(y - self.top, self.pitch_y)
+        if row < 0 or row >= len(self.row_starts) or offset_y >= self.slot_height:
+            return -1
+        column, offset_x = divmod(x - self.row_starts[row], self.pitch_x)
+        if column < 0 or column >= self.columns or offset_x >= self.slot_width:
+            return -1
+        index = row * self.columns + column
+        return index if index < len(self.rects) else -1
+
+class ColorButtonLayout:
+    def __init__(self, palette: Mapping[str, Tuple[int, int, int]], grid: SlotGrid,
+                 button_factory: Callable[[str, pygame.Rect, Tuple[int, int, int]], Any]):
+        self.palette = palette
+        self.grid = grid
+        self.buttons = {name: button_factory(name, grid.rects[i], color)
+                        for i, (name, color) in enumerate(palette.items())}
+        self.slots = list(self.buttons.values())
+
+    def arrange(self, order: Sequence[str]) -> None:
+        for i, name in enumerate(order):
+            button = self.buttons[name]
+            button.rect = self.grid.rects[i]
+            self.slots[i] = button
+
+    def hit_test(self, pos: Tuple[int, int]) -> Optional[Any]:
+        index = self.grid.hit_test(pos)
+        return self.slots[index] if index >= 0 else None
+
+class LazyButtonGroups(dict):
+    def __init__(self, factories: Dict[str, Callable[[], List[Any]]]):
+        super().__init__()
+        self.factories = factories
+
+    def __missing__(self, group: str) -> List[Any]:
+        factory = self.factories.get(group)
+        if factory is None:
+            raise KeyError(group)
+        buttons = self[group] = factory()
+        return buttons
+
+    def get(self, group: str, default: Any = None) -> Any:
+        try:
+            return self[group]
+        except KeyError:
+            return default
\ No newline at end of file
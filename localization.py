@@ -1,7 +1,8 @@
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Mapping, Optional, Tuple
 from dataclasses import dataclass
-import json
+from types import MappingProxyType
 from pathlib import Path
+from translation_store import TranslationStore
 
 @dataclass
 class ColorRGB:
@@ -19,10 +20,109 @@ class ColorRGB:
 class LocalizationError(Exception):
     pass
 
+DEFAULT_TRANSLATIONS: Dict[str, Dict[str, Any]] = {
+    "english": {
+        "start": "Press any key to start",
+        "avg_time": "Average time: {avg_time:.2f} sec",
+        "coefficient": "Coefficient: {coefficient:.2f}",
+        "accuracy": "Accuracy: {accuracy:.2f}%",
+        "correct": "Correct!",
+        "incorrect": "Incorrect!",
+        "restart": "Restart",
+        "menu": "Main Menu",
+        "play": "Play",
+        "settings": "Settings",
+        "exit": "Exit",
+        "language": "Language",
+        "resolution": "Resolution",
+        "display_mode": "Display Mode",
+        "back": "Back",
+        "russian": "Russian",
+        "ukrainian": "Ukrainian",
+        "english": "English",
+        "fullscreen": "Fullscreen",
+        "noframe": "Fullscreen No Border",
+        "windowed": "Windowed",
+        "colors": {
+            "red": "Red",
+            "green": "Green",
+            "blue": "Blue",
+            "yellow": "Yellow",
+            "purple": "Purple",
+            "black": "Black"
+        }
+    },
+    "russian": {
+        "start": "Нажмите любую клавишу для начала",
+        "avg_time": "Среднее время: {avg_time:.2f} сек",
+        "coefficient": "Коэффициент: {coefficient:.2f}",
+        "accuracy": "Точность: {accuracy:.2f}%",
+        "correct": "Правильно!",
+        "incorrect": "Неправильно!",
+        "restart": "Рестарт",
+        "menu": "Главное меню",
+        "play": "Играть",
+        "settings": "Настройки",
+        "exit": "Выход",
+        "language": "Язык",
+        "resolution": "Разрешение",
+        "display_mode": "Режим экрана",
+        "back": "Назад",
+        "russian": "Русский",
+        "ukrainian": "Украинский",
+        "english": "Английский",
+        "fullscreen": "Полноэкранный",
+        "noframe": "Полноэкранный без рамки",
+        "windowed": "Оконный",
+        "colors": {
+            "red": "Красный",
+            "green": "Зеленый",
+            "blue": "Синий",
+            "yellow": "Желтый",
+            "purple": "Фиолетовый",
+            "black": "Черный"
+        }
+    },
+    "ukrainian": {
+        "start": "Натисніть будь-яку клавішу для початку",
+        "avg_time": "Середній час: {avg_time:.2f} сек",
+        "coefficient": "Коефіцієнт: {coefficient:.2f}",
+        "accuracy": "Точність: {accuracy:.2f}%",
+        "correct": "Правильно!",
+        "incorrect": "Неправильно!",
+        "restart": "Перезапуск",
+        "menu": "Головне меню",
+        "play": "Грати",
+        "settings": "Налаштування",
+        "exit": "Вихід",
+        "language": "Мова",
+        "resolution": "Роздільна здатність",
+        "display_mode": "Режим екрана",
+        "back": "Назад",
+        "russian": "Російська",
+        "ukrainian": "Українська",
+        "english": "Англійська",
+        "fullscreen": "Повноекранний",
+        "noframe": "Повноекранний без рамки",
+        "windowed": "Віконний",
+        "colors": {
+            "red": "Червоний",
+            "green": "Зелений",
+            "blue": "Синій",
+            "yellow": "Жовтий",
+            "purple": "Фіолетовий",
+            "black": "Чорний"
+        }
+    }
+}
+
 class Localization:
     SUPPORTED_LANGUAGES = {"english", "russian", "ukrainian"}
+    store = TranslationStore(Path("translations.json"), DEFAULT_TRANSLATIONS)
     
-    def __init__(self, language: str = "english"):
+    def __init__(self, language: str = "english", store: Optional[TranslationStore] = None):
+        if store is not None:
+            self.store = store
         self._colors: Dict[str, ColorRGB] = {
             "red": ColorRGB(255, 0, 0),
             "green": ColorRGB(0, 255, 0),
@@ -32,166 +132,59 @@ class Localization:
             "black": ColorRGB(0, 0, 0)
         }
         
-        self._translations = self._load_translations()
+        self._compile_colors()
         self.set_language(language)
 
-    def _load_translations(self) -> Dict[str, Dict[str, Any]]:
-        try:
-            translations_path = Path("translations.json")
-            if translations_path.exists():
-                with open(translations_path, "r", encoding="utf-8") as f:
-                    return json.load(f)
-        except Exception as e:
-            print(f"Warning: Could not load translations from file: {e}")
-        
-        return {
-            "english": {
-                "start": "Press any key to start",
-                "avg_time": "Average time: {avg_time:.2f} sec",
-                "coefficient": "Coefficient: {coefficient:.2f}",
-                "accuracy": "Accuracy: {accuracy:.2f}%",
-                "correct": "Correct!",
-                "incorrect": "Incorrect!",
-                "restart": "Restart",
-                "menu": "Main Menu",
-                "play": "Play",
-                "settings": "Settings",
-                "exit": "Exit",
-                "language": "Language",
-                "resolution": "Resolution",
-                "display_mode": "Display Mode",
-                "back": "Back",
-                "russian": "Russian",
-                "ukrainian": "Ukrainian",
-                "english": "English",
-                "fullscreen": "Fullscreen",
-                "noframe": "Fullscreen No Border",
-                "windowed": "Windowed",
-                "colors": {
-                    "red": "Red",
-                    "green": "Green",
-                    "blue": "Blue",
-                    "yellow": "Yellow",
-                    "purple": "Purple",
-                    "black": "Black"
-                }
-            },
-            "russian": {
-                "start": "Нажмите любую клавишу для начала",
-                "avg_time": "Среднее время: {avg_time:.2f} сек",
-                "coefficient": "Коэффициент: {coefficient:.2f}",
-                "accuracy": "Точность: {accuracy:.2f}%",
-                "correct": "Правильно!",
-                "incorrect": "Неправильно!",
-                "restart": "Рестарт",
-                "menu": "Главное меню",
-                "play": "Играть",
-                "settings": "Настройки",
-                "exit": "Выход",
-                "language": "Язык",
-                "resolution": "Разрешение",
-                "display_mode": "Режим экрана",
-                "back": "Назад",
-                "russian": "Русский",
-                "ukrainian": "Украинский",
-                "english": "Английский",
-                "fullscreen": "Полноэкранный",
-                "noframe": "Полноэкранный без рамки",
-                "windowed": "Оконный",
-                "colors": {
-                    "red": "Красный",
-                    "green": "Зеленый",
-                    "blue": "Синий",
-                    "yellow": "Желтый",
-                    "purple": "Фиолетовый",
-                    "black": "Черный"
-                }
-            },
-            "ukrainian": {
-                "start": "Натисніть будь-яку клавішу для початку",
-                "avg_time": "Середній час: {avg_time:.2f} сек",
-                "coefficient": "Коефіцієнт: {coefficient:.2f}",
-                "accuracy": "Точність: {accuracy:.2f}%",
-                "correct": "Правильно!",
-                "incorrect": "Неправильно!",
-                "restart": "Перезапуск",
-                "menu": "Головне меню",
-                "play": "Грати",
-                "settings": "Налаштування",
-                "exit": "Вихід",
-                "language": "Мова",
-                "resolution": "Роздільна здатність",
-                "display_mode": "Режим екрана",
-                "back": "Назад",
-                "russian": "Російська",
-                "ukrainian": "Українська",
-                "english": "Англійська",
-                "fullscreen": "Повноекранний",
-                "noframe": "Повноекранний без рамки",
-                "windowed": "Віконний",
-                "colors": {
-                    "red": "Червоний",
-                    "green": "Зелений",
-                    "blue": "Синій",
-                    "yellow": "Жовтий",
-                    "purple": "Фіолетовий",
-                    "black": "Чорний"
-                }
-            }
-        }
-
     def save_translations(self) -> None:
-        try:
-            with open("translations.json", "w", encoding="utf-8") as f:
-                json.dump(self._translations, f, ensure_ascii=False, indent=4)
-        except Exception as e:
-            print(f"Warning: Could not save translations to file: {e}")
+        self.store.save()
 
     def set_language(self, language: str) -> None:
-        if language not in self.SUPPORTED_LANGUAGES:
+        if language not in self.SUPPORTED_LANGUAGES and language not in self.store.languages():
             raise LocalizationError(f"Language '{language}' is not supported. "
                                   f"Supported languages are: {', '.join(sorted(self.SUPPORTED_LANGUAGES))}")
         self._current_language = language
+        self._compile_language()
+
+    def _compile_language(self) -> None:
+        compiled = self.store.language(self._current_language)
+        if compiled is None:
+            print(f"Warning: Missing translations for language '{self._current_language}'")
+            compiled = ({}, {})
+        self._text_table, self._color_name_table = compiled
+
+    def _compile_colors(self) -> None:
+        self._color_table: Mapping[str, Tuple[int, int, int]] = MappingProxyType(
+            {name: color.to_tuple() for name, color in self._colors.items()}
+        )
 
     @property
     def current_language(self) -> str:
         return self._current_language
 
     @property
-    def colors(self) -> Dict[str, Tuple[int, int, int]]:
-        return {name: color.to_tuple() for name, color in self._colors.items()}
+    def colors(self) -> Mapping[str, Tuple[int, int, int]]:
+        return self._color_table
 
     def get_text(self, key: str) -> str:
-        try:
-            return self._translations[self._current_language].get(key, key)
-        except KeyError:
-            print(f"Warning: Missing translation for key '{key}' in language '{self._current_language}'")
-            return key
+        return self._text_table.get(key, key)
 
     def get_color_name(self, color: str) -> str:
-        try:
-            return self._translations[self._current_language]["colors"].get(color, color)
-        except KeyError:
-            print(f"Warning: Missing color translation for '{color}' in language '{self._current_language}'")
-            return color
+        return self._color_name_table.get(color, color)
 
     def add_translation(self, language: str, translations: Dict[str, Any]) -> None:
         if not isinstance(translations, dict) or "colors" not in translations:
             raise LocalizationError("Translations must be a dictionary with 'colors' section")
-        self._translations[language] = translations
+        self.store.update(language, translations)
         self.SUPPORTED_LANGUAGES.add(language)
-        self.save_translations()
+        if language == self._current_language:
+            self._compile_language()
 
     def add_color(self, name: str, color: Tuple[int, int, int]) -> None:
         if not all(isinstance(v, int) and 0 <= v <= 255 for v in color):
             raise LocalizationError("Color values must be integers between 0 and 255")
             
         self._colors[name] = ColorRGB.from_tuple(color)
+        self._compile_colors()
         
-        for lang in self._translations:
-            if "colors" not in self._translations[lang]:
-                self._translations[lang]["colors"] = {}
-            if name not in self._translations[lang]["colors"]:
-                self._translations[lang]["colors"][name] = name
-        
-        self.save_translations()
\ No newline at end of file
+        self.store.add_color_name(name)
+        self._compile_language()
\ No newline at end of file
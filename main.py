@@ -1,12 +1,31 @@
 import pygame
-import random
 import json
 import platform
 import asyncio
-from typing import Dict, List, Tuple, Callable
-from dataclasses import dataclass
+import math
+import time
+import uuid
+from collections import deque
+from typing import Any, ClassVar, Deque, Dict, List, Optional, Tuple, Callable, Union, get_args, get_origin
+from dataclasses import dataclass, asdict, field, fields
 from pathlib import Path
 from localization import Localization
+from text_cache import TextCache
+from dirty_rects import DirtyRectTracker
+from timing import ReactionTimer
+from schedule import TrialSchedule
+from trial_log import TrialLogWriter
+from profiler import FrameProfiler
+from memory_tracker import MemoryTracker
+from config_writer import DebouncedJsonWriter
+from frame_scheduler import FrameScheduler
+from layout import ColorButtonLayout, LazyButtonGroups, SlotGrid
+from resources import SharedResources
+from collector import CollectorClient
+from session import StroopSession
+from stimulus_atlas import StimulusAtlas
+from trial_types import DEFAULT_TRIAL_TYPES, RenderPlan, TrialType, resolve_trial_types
+from recording import InputRecorder
 
 @dataclass
 class GameConfig:
@@ -21,25 +40,95 @@ class GameConfig:
     font_size: int = 74
     small_font_size: int = 36
     square_size: int = 100
+    dirty_rects: bool = False
+    seed: Optional[int] = None
+    congruent_ratio: Optional[float] = None
+    no_immediate_repeats: bool = False
+    record_trials: bool = False
+    results_dir: str = "results"
+    profile: bool = False
+    profile_output: str = "profile.json"
+    memory_tracking: bool = False
+    memory_snapshot_interval: int = 600
+    memory_output: str = "memory.json"
+    collector: str = ""
+    record_input: str = ""
+    trial_types: List[str] = field(default_factory=lambda: list(DEFAULT_TRIAL_TYPES))
+
+    writer: ClassVar[DebouncedJsonWriter] = DebouncedJsonWriter(Path("config.json"))
 
     @classmethod
     def load(cls) -> 'GameConfig':
         try:
-            config_path = Path("config.json")
+            config_path = cls.writer.path
             if config_path.exists():
                 with open(config_path, "r", encoding="utf-8") as f:
                     data = json.load(f)
-                return cls(**data)
+                return cls.from_dict(data)
         except Exception as e:
             print(f"Error loading config: {e}")
         return cls()
 
+    @classmethod
+    def from_dict(cls, data: Any) -> 'GameConfig':
+        if not isinstance(data, dict):
+            raise ValueError("config must be a JSON object")
+        known = {field.name: field for field in fields(cls)}
+        values = {}
+        for key, value in data.items():
+            field = known.get(key)
+            if field is None:
+                print(f"Warning: Ignoring unknown config key '{key}'")
+            elif not cls._matches_type(value, field.type):
+                print(f"Warning: Ignoring invalid value {value!r} for config key '{key}'")
+            elif key == "congruent_ratio" and value is not None and not 0.0 <= value <= 1.0:
+                print(f"Warning: Ignoring out-of-range value {value!r} for config key '{key}'")
+            else:
+                values[key] = value
+        return cls(**values)
+
+    @staticmethod
+    def _matches_type(value: Any, expected: Any) -> bool:
+        if get_origin(expected) is Union:
+            return any(GameConfig._matches_type(value, arg) for arg in get_args(expected))
+        if expected is type(None):
+            return value is None
+        if expected is float:
+            return isinstance(value, (int, float)) and not isinstance(value, bool)
+        if expected is int:
+            return isinstance(value, int) and not isinstance(value, bool)
+        if get_origin(expected) is list:
+            return isinstance(value, list) and all(GameConfig._matches_type(item, get_args(expected)[0]) for item in value)
+        return isinstance(value, expected)
+
     def save(self) -> None:
-        try:
-            with open("config.json", "w", encoding="utf-8") as f:
-                json.dump(self.__dict__, f, indent=4)
-        except Exception as e:
-            print(f"Error saving config: {e}")
+        self.writer.schedule(asdict(self))
+
+    @classmethod
+    def flush(cls) -> None:
+        cls.writer.flush()
+
+def open_display(config: GameConfig, info: Any, persist: bool = True) -> pygame.Surface:
+    try:
+        if config.display_mode == "fullscreen":
+            return pygame.display.set_mode((info.current_w, info.current_h), pygame.FULLSCREEN)
+        if config.display_mode == "noframe":
+            return pygame.display.set_mode((info.current_w, info.current_h), pygame.NOFRAME)
+        return pygame.display.set_mode((config.screen_width, config.screen_height))
+    except pygame.error:
+        screen = pygame.display.set_mode((1280, 720))
+        config.screen_width = 1280
+        config.screen_height = 720
+        config.display_mode = "windowed"
+        if persist:
+            config.save()
+        return screen
+
+def init_subsystems() -> None:
+    pygame.display.init()
+    pygame.font.init()
+    # Without pygame.init() the SDL timer is only started as a side effect of time.wait; get_ticks() stays 0 otherwise.
+    pygame.time.wait(0)
 
 class Button:
     def __init__(self, text: str, rect: pygame.Rect, action: Callable, color: Tuple[int, int, int]):
@@ -48,82 +137,117 @@ class Button:
         self.action = action
         self.color = color
 
-    def draw(self, screen: pygame.Surface, font: pygame.font.Font, localization: Localization) -> None:
-        mouse_pos = pygame.mouse.get_pos()
-        color = (150, 150, 150) if self.rect.collidepoint(mouse_pos) else self.color
-        pygame.draw.rect(screen, color, self.rect)
+    def is_hovered(self, mouse_pos: Tuple[int, int]) -> bool:
+        return self.rect.collidepoint(mouse_pos)
+
+    def text_color(self) -> Tuple[int, int, int]:
         brightness = sum(self.color) / 3
-        text_color = (255, 255, 255) if brightness < 128 else (0, 0, 0)
-        text_surface = font.render(localization.get_text(self.text), True, text_color)
+        return (255, 255, 255) if brightness < 128 else (0, 0, 0)
+
+    def draw(self, screen: pygame.Surface, font: pygame.font.Font, localization: Localization,
+             text_cache: TextCache, mouse_pos: Tuple[int, int]) -> None:
+        color = (150, 150, 150) if self.is_hovered(mouse_pos) else self.color
+        pygame.draw.rect(screen, color, self.rect)
+        text_surface = text_cache.render(font, localization.get_text(self.text), self.text_color())
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
 
 class StroopTest:
-    def __init__(self):
-        pygame.init()
+    def __init__(self, config: Optional[GameConfig] = None, screen: Optional[pygame.Surface] = None,
+                 resources: Optional[SharedResources] = None, label: str = "",
+                 persist_config: Optional[bool] = None):
+        self.owns_display = screen is None
+        self.persist_config = self.owns_display if persist_config is None else persist_config
+        if self.owns_display:
+            init_subsystems()
         self.info = pygame.display.Info()
-        self.config = GameConfig.load()
-        self.setup_display()
+        self.config = config if config is not None else GameConfig.load()
+        self.resources = resources if resources is not None else SharedResources()
+        self.label = label
+        self.get_ticks: Callable[[], int] = pygame.time.get_ticks
+        self.setup_display(screen)
         self.setup_game_state()
 
-    def setup_display(self) -> None:
-        self.SCREEN_WIDTH = self.info.current_w
-        self.SCREEN_HEIGHT = self.info.current_h
+    def setup_display(self, screen: Optional[pygame.Surface] = None) -> None:
+        self.FPS = 60
+        self.scheduler = FrameScheduler(self.FPS)
+        if screen is not None:
+            self.screen = screen
+            self.SCREEN_WIDTH, self.SCREEN_HEIGHT = self.screen.get_size()
+            self.SCALE_FACTOR = min(self.SCREEN_WIDTH / 1920, self.SCREEN_HEIGHT / 1080)
+            return
+
+        self.screen = open_display(self.config, self.info, self.persist_config)
+        self.mode_flags = self.display_flags()
+        self.SCREEN_WIDTH, self.SCREEN_HEIGHT = self.screen.get_size()
         self.SCALE_FACTOR = min(self.SCREEN_WIDTH / 1920, self.SCREEN_HEIGHT / 1080)
-        
-        try:
-            if self.config.display_mode == "fullscreen":
-                self.screen = pygame.display.set_mode((self.SCREEN_WIDTH, self.SCREEN_HEIGHT), pygame.FULLSCREEN)
-            elif self.config.display_mode == "noframe":
-                self.screen = pygame.display.set_mode((self.SCREEN_WIDTH, self.SCREEN_HEIGHT), pygame.NOFRAME)
-            else:
-                self.screen = pygame.display.set_mode((self.config.screen_width, self.config.screen_height))
-        except pygame.error:
-            self.screen = pygame.display.set_mode((1280, 720))
-            self.config.screen_width = 1280
-            self.config.screen_height = 720
-            self.config.display_mode = "windowed"
-            self.config.save()
-
         pygame.display.set_caption("Stroop Test")
-        self.clock = pygame.time.Clock()
-        self.FPS = 60
 
     def setup_game_state(self) -> None:
         self.localization = Localization(self.config.language)
-        self.font = pygame.font.Font(None, int(self.config.font_size * self.SCALE_FACTOR))
-        self.small_font = pygame.font.Font(None, int(self.config.small_font_size * self.SCALE_FACTOR))
-        
+        self.text_cache = self.resources.text_cache
+        self.dirty_rects = DirtyRectTracker() if self.config.dirty_rects and self.owns_display else None
+        self.timer = ReactionTimer()
+        self.trial_log = TrialLogWriter(self.config.results_dir) if self.config.record_trials else None
+        self.profiler = FrameProfiler(self.FPS) if self.config.profile else None
+        self.memory = MemoryTracker(self.config.memory_snapshot_interval) if self.config.memory_tracking else None
+        self.collector = CollectorClient.from_address(self.config.collector) if self.config.collector else None
+        self.recorder = InputRecorder(asdict(self.config), self.screen.get_size()) if self.config.record_input else None
+        self.replay_seeds: Deque[int] = deque()
+        self.prewarm_task: Optional[asyncio.Task] = None
+        self.atlas: Optional[StimulusAtlas] = None
+        self.layouts: Dict[Tuple[int, int], Tuple[LazyButtonGroups, Optional[ColorButtonLayout], Optional[StimulusAtlas]]] = {}
+        self.results_view: List[Tuple[str, pygame.Surface, pygame.Rect]] = []
+        self.trial_types = self.load_trial_types()
+        self.render_plan: Optional[RenderPlan] = None
+        self.render_generation = 0
+        self.plan_generation = -1
+        self.palette = self.localization.colors
+
         self.state = "menu"
         self.running = True
-        self.stroop_data = self.create_stroop_data()
+        self.session = StroopSession(self.config.trial_count, (self.SCREEN_WIDTH / 2, self.SCREEN_HEIGHT / 2),
+                                     len(self.trial_types))
+        self.frame_ticks = 0
         self.countdown_start = 0
         self.countdown_duration = 3000
         self.buttons = self.create_buttons()
 
-    def create_stroop_data(self) -> Dict:
-        return {
-            "part": 1,
-            "trials_left": self.config.trial_count,
-            "word": "",
-            "color": "",
-            "correct_color": "",
-            "position": (self.SCREEN_WIDTH / 2, self.SCREEN_HEIGHT / 2),
-            "start_time": 0,
-            "reaction_times": [],
-            "correct_clicks": 0,
-            "incorrect_clicks": 0,
-            "feedback": "",
-            "feedback_time": 0,
-            "score": 0,
-            "total_time": 0
-        }
-
-    def create_buttons(self) -> Dict[str, List[Button]]:
-        button_width = int(self.config.button_width * self.SCALE_FACTOR)
-        button_height = int(self.config.button_height * self.SCALE_FACTOR)
-
-        menu_buttons = [
+    def load_trial_types(self) -> List[TrialType]:
+        try:
+            if not self.config.trial_types:
+                raise ValueError("No trial types configured")
+            return resolve_trial_types(self.config.trial_types)
+        except ValueError as e:
+            print(f"Warning: {e}. Using the default trial types")
+            return resolve_trial_types(DEFAULT_TRIAL_TYPES)
+
+    @property
+    def font(self) -> pygame.font.Font:
+        return self.resources.font(int(self.config.font_size * self.SCALE_FACTOR))
+
+    @property
+    def small_font(self) -> pygame.font.Font:
+        return self.resources.font(int(self.config.small_font_size * self.SCALE_FACTOR))
+
+    def create_buttons(self) -> LazyButtonGroups:
+        self.color_layout = None
+        return LazyButtonGroups({
+            "menu": self.create_menu_buttons,
+            "settings": self.create_settings_buttons,
+            "language": self.create_language_buttons,
+            "resolution": self.create_resolution_buttons,
+            "display_mode": self.create_display_mode_buttons,
+            "color": lambda: self.ensure_color_layout().slots,
+            "results": self.create_result_buttons
+        })
+
+    def button_size(self) -> Tuple[int, int]:
+        return int(self.config.button_width * self.SCALE_FACTOR), int(self.config.button_height * self.SCALE_FACTOR)
+
+    def create_menu_buttons(self) -> List[Button]:
+        button_width, button_height = self.button_size()
+        return [
             Button("play", pygame.Rect(self.SCREEN_WIDTH * 0.4, self.SCREEN_HEIGHT * 0.3, button_width, button_height),
                   lambda: self.set_state("countdown"), (200, 200, 200)),
             Button("settings", pygame.Rect(self.SCREEN_WIDTH * 0.4, self.SCREEN_HEIGHT * 0.45, button_width, button_height),
@@ -132,7 +256,9 @@ class StroopTest:
                   lambda: setattr(self, 'running', False), (200, 200, 200))
         ]
 
-        settings_buttons = [
+    def create_settings_buttons(self) -> List[Button]:
+        button_width, button_height = self.button_size()
+        return [
             Button("language", pygame.Rect(self.SCREEN_WIDTH * 0.4, self.SCREEN_HEIGHT * 0.3, button_width, button_height),
                   lambda: self.set_state("language"), (200, 200, 200)),
             Button("resolution", pygame.Rect(self.SCREEN_WIDTH * 0.4, self.SCREEN_HEIGHT * 0.45, button_width, button_height),
@@ -143,7 +269,9 @@ class StroopTest:
                   lambda: self.set_state("menu"), (200, 200, 200))
         ]
 
-        language_buttons = [
+    def create_language_buttons(self) -> List[Button]:
+        button_width, button_height = self.button_size()
+        return [
             Button("russian", pygame.Rect(self.SCREEN_WIDTH * 0.4, self.SCREEN_HEIGHT * 0.3, button_width, button_height),
                   lambda: self.change_language("russian"), (200, 200, 200)),
             Button("ukrainian", pygame.Rect(self.SCREEN_WIDTH * 0.4, self.SCREEN_HEIGHT * 0.45, button_width, button_height),
@@ -152,14 +280,18 @@ class StroopTest:
                   lambda: self.change_language("english"), (200, 200, 200))
         ]
 
+    def create_resolution_buttons(self) -> List[Button]:
+        button_width, button_height = self.button_size()
         resolutions = [(800, 600), (1280, 720), (1920, 1080), (2560, 1440)]
-        resolution_buttons = [
+        return [
             Button(f"{w}x{h}", pygame.Rect(self.SCREEN_WIDTH * 0.4, self.SCREEN_HEIGHT * (0.3 + i * 0.15), button_width, button_height),
                   lambda w=w, h=h: self.change_resolution(w, h), (200, 200, 200))
             for i, (w, h) in enumerate(resolutions) if w <= self.info.current_w and h <= self.info.current_h
         ]
 
-        display_mode_buttons = [
+    def create_display_mode_buttons(self) -> List[Button]:
+        button_width, button_height = self.button_size()
+        return [
             Button("fullscreen", pygame.Rect(self.SCREEN_WIDTH * 0.4, self.SCREEN_HEIGHT * 0.3, button_width, button_height),
                   lambda: self.change_display_mode("fullscreen"), (200, 200, 200)),
             Button("noframe", pygame.Rect(self.SCREEN_WIDTH * 0.4, self.SCREEN_HEIGHT * 0.45, button_width, button_height),
@@ -168,17 +300,8 @@ class StroopTest:
                   lambda: self.change_display_mode("windowed"), (200, 200, 200))
         ]
 
-        total_buttons = len(self.localization.colors)
-        total_width = total_buttons * button_width + (total_buttons - 1) * self.config.button_spacing
-        start_x = (self.SCREEN_WIDTH - total_width) / 2
-        color_buttons = [
-            Button(name, pygame.Rect(start_x + i * (button_width + self.config.button_spacing),
-                                   self.SCREEN_HEIGHT * 0.75, button_width, button_height),
-                  lambda c=name: self.check_color(c), self.localization.colors[name])
-            for i, name in enumerate(self.localization.colors.keys())
-        ]
-
-        result_buttons = [
+    def create_result_buttons(self) -> List[Button]:
+        return [
             Button("restart", pygame.Rect(self.SCREEN_WIDTH * 0.35, self.SCREEN_HEIGHT * 0.6,
                                         self.SCREEN_WIDTH * 0.15, self.SCREEN_HEIGHT * 0.1),
                   lambda: self.reset_game(), (200, 200, 200)),
@@ -187,51 +310,150 @@ class StroopTest:
                   lambda: self.set_state("menu"), (200, 200, 200))
         ]
 
-        return {
-            "menu": menu_buttons,
-            "settings": settings_buttons,
-            "language": language_buttons,
-            "resolution": resolution_buttons,
-            "display_mode": display_mode_buttons,
-            "color": color_buttons,
-            "results": result_buttons
-        }
+    def ensure_color_layout(self) -> ColorButtonLayout:
+        if self.color_layout is None or self.color_layout.palette is not self.localization.colors:
+            self.color_layout = self.create_color_layout()
+            self.buttons["color"] = self.color_layout.slots
+        return self.color_layout
+
+    def create_color_layout(self) -> ColorButtonLayout:
+        palette = self.localization.colors
+        button_width, button_height = self.button_size()
+        grid = SlotGrid(len(palette), self.SCREEN_WIDTH, self.SCREEN_HEIGHT, button_width, button_height,
+                        self.config.button_spacing, self.SCREEN_HEIGHT * 0.75)
+        return ColorButtonLayout(palette, grid,
+                                 lambda name, rect, color: Button(name, rect, lambda c=name: self.check_color(c), color))
 
     def set_state(self, new_state: str) -> None:
         self.state = new_state
+        self.scheduler.request_render()
+        if self.profiler is not None:
+            self.profiler.event(f"set_state:{new_state}")
+        if self.recorder is not None:
+            self.recorder.record_transition(new_state, self.frame_ticks)
+        if self.memory is not None:
+            self.memory.snapshot(f"set_state:{new_state}")
         if new_state == "countdown":
-            self.countdown_start = pygame.time.get_ticks()
+            self.countdown_start = self.frame_ticks
             self.reset_game()
-
-    def handle_events(self) -> None:
-        for event in pygame.event.get():
+        elif new_state == "game":
+            self.timer.arm()
+        elif new_state == "results":
+            self.freeze_results()
+            if self.recorder is not None:
+                self.recorder.record_result(self.session)
+            if self.trial_log is not None:
+                self.trial_log.end_session()
+            if self.collector is not None:
+                self.collector.submit(self.session_summary())
+
+    def handle_events(self, events: Optional[List[pygame.event.Event]] = None) -> bool:
+        if events is None:
+            events = pygame.event.get()
+        self.frame_ticks = self.get_ticks()
+        if self.recorder is not None:
+            self.recorder.record_input(self.frame_ticks, events)
+        for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
             elif event.type == pygame.MOUSEBUTTONDOWN:
+                self.timer.stamp(event)
                 self.handle_mouse_click(event.pos)
             elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 if self.state == "game":
                     self.set_state("menu")
                 else:
                     self.running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3 and self.profiler is not None:
+                self.profiler.overlay_visible = not self.profiler.overlay_visible
+        return bool(events)
 
     def handle_mouse_click(self, pos: Tuple[int, int]) -> None:
-        button_list = self.buttons.get(self.state, 
-                                     self.buttons["color"] if self.state == "game" else self.buttons["results"])
-        for button in button_list:
+        if self.state == "game":
+            button = self.color_layout.hit_test(pos)
+            if button is not None:
+                button.action()
+            return
+        for button in self.buttons.get(self.state, []):
             if button.rect.collidepoint(pos):
                 button.action()
 
+    def update(self) -> None:
+        self.frame_ticks = self.get_ticks()
+        if self.state == "countdown" and self.frame_ticks - self.countdown_start >= self.countdown_duration:
+            if self.recorder is not None:
+                self.recorder.record_update(self.frame_ticks)
+            self.set_state("game")
+
+    def is_animating(self) -> bool:
+        return self.state in ("countdown", "game")
+
     async def run(self) -> None:
+        if self.collector is not None:
+            self.collector.start()
         while self.running:
-            self.handle_events()
-            self.render()
-            self.clock.tick(self.FPS)
-            await asyncio.sleep(1.0 / self.FPS)
-        pygame.quit()
+            if self.profiler is not None:
+                self.profiler.begin_frame()
+            had_events = self.handle_events(self.scheduler.poll_events())
+            self.profile_lap("handle_events")
+            self.update()
+            active = self.is_animating()
+            if self.scheduler.should_render(active, had_events):
+                self.render()
+                if self.prewarm_task is None:
+                    self.prewarm_task = asyncio.ensure_future(self.prewarm())
+            await self.scheduler.wait(self.is_animating())
+            self.profile_lap("frame_wait", wait=True)
+            if self.profiler is not None:
+                self.profiler.end_frame(idle=not active)
+            if self.memory is not None:
+                self.memory.end_frame()
+        if self.prewarm_task is not None:
+            self.prewarm_task.cancel()
+        if self.collector is not None:
+            await self.collector.close()
+        self.shutdown()
+
+    async def prewarm(self) -> None:
+        for button in self.buttons["color"]:
+            self.text_cache.render(self.small_font, self.localization.get_text(button.text), button.text_color())
+            await asyncio.sleep(0)
+        for digit in range(1, 5):
+            self.text_cache.render(self.font, str(digit), (0, 0, 0))
+        await asyncio.sleep(0)
+        for key, color in (("correct", (0, 255, 0)), ("incorrect", (255, 0, 0))):
+            self.text_cache.render(self.small_font, self.localization.get_text(key), color)
+        await asyncio.sleep(0)
+        self.ensure_atlas()
+
+    def shutdown(self) -> None:
+        GameConfig.flush()
+        self.localization.store.flush()
+        if self.trial_log is not None:
+            self.trial_log.close()
+        if self.profiler is not None:
+            self.profiler.dump(self.config.profile_output)
+        if self.memory is not None:
+            self.memory.dump(self.config.memory_output)
+            self.memory.stop()
+        if self.recorder is not None and self.config.record_input:
+            self.recorder.save(self.config.record_input)
+        if self.owns_display:
+            pygame.quit()
+
+    def profile_lap(self, phase: str, wait: bool = False) -> None:
+        if self.profiler is not None:
+            self.profiler.lap(phase, wait)
 
     def render(self) -> None:
+        self.draw_frame()
+        self.present()
+
+    def draw_frame(self) -> None:
+        state = self.state
         self.screen.fill((255, 255, 255))
+        if self.dirty_rects is not None:
+            self.dirty_rects.begin_frame()
         
         if self.state in ["menu", "settings", "language", "resolution", "display_mode"]:
             self.render_buttons(self.buttons[self.state])
@@ -242,178 +464,274 @@ class StroopTest:
         elif self.state == "results":
             self.render_results()
             
-        pygame.display.flip()
+        if self.profiler is not None:
+            self.render_profiler_overlay()
+            self.profiler.lap(f"render:{state}")
+
+    def present(self) -> None:
+        if self.dirty_rects is not None:
+            self.dirty_rects.present()
+        else:
+            pygame.display.flip()
+        self.timer.on_present()
+        self.profile_lap("display_flip")
+
+    def render_profiler_overlay(self) -> None:
+        if not self.profiler.overlay_visible:
+            return
+        y = 5
+        for line in self.profiler.overlay_lines():
+            surface = self.small_font.render(line, True, (80, 80, 80))
+            rect = surface.get_rect(topleft=(5, y))
+            self.screen.blit(surface, rect)
+            self.mark_dirty(rect, line)
+            y += rect.height
+
+    def mouse_pos(self) -> Tuple[int, int]:
+        x, y = pygame.mouse.get_pos()
+        offset_x, offset_y = self.screen.get_abs_offset()
+        return x - offset_x, y - offset_y
+
+    def mark_dirty(self, rect: pygame.Rect, signature) -> None:
+        if self.dirty_rects is not None:
+            self.dirty_rects.mark(rect, signature)
 
     def render_buttons(self, button_list: List[Button]) -> None:
+        mouse_pos = self.mouse_pos()
         for button in button_list:
-            button.draw(self.screen, self.small_font, self.localization)
+            button.draw(self.screen, self.small_font, self.localization, self.text_cache, mouse_pos)
+            self.mark_dirty(button.rect, (button.text, button.color, button.is_hovered(mouse_pos)))
 
     def render_countdown(self) -> None:
-        elapsed = pygame.time.get_ticks() - self.countdown_start
+        elapsed = self.get_ticks() - self.countdown_start
         countdown = max(0, 3 - elapsed // 1000)
         self.draw_text(str(countdown + 1), self.font, (0, 0, 0), (self.SCREEN_WIDTH / 2, self.SCREEN_HEIGHT / 2))
-        if elapsed >= self.countdown_duration:
-            self.set_state("game")
 
     def render_game(self) -> None:
-        if self.stroop_data["part"] in [1, 3]:
-            self.draw_text(self.stroop_data["word"], self.font, 
-                         self.localization.colors[self.stroop_data["color"]], 
-                         self.stroop_data["position"])
-        elif self.stroop_data["part"] == 2:
-            self.draw_square(self.stroop_data["color"], self.stroop_data["position"])
+        if self.palette is not self.localization.colors:
+            self.invalidate_render_plans()
+        plan = self.render_plan
+        if plan is None or self.plan_generation != self.render_generation:
+            plan = self.render_plan = self.compile_trial()
+        if plan.rect is not None:
+            self.screen.blit(plan.surface, plan.rect, plan.area)
+            self.mark_dirty(plan.rect, plan.signature)
         
         self.render_buttons(self.buttons["color"])
         
-        if (self.stroop_data["feedback"] and 
-            pygame.time.get_ticks() - self.stroop_data["feedback_time"] < 500):
-            color = (0, 255, 0) if self.stroop_data["feedback"] == self.localization.get_text("correct") else (255, 0, 0)
-            self.draw_text(self.stroop_data["feedback"], self.small_font, color, 
+        if (self.session.feedback and 
+            self.get_ticks() - self.session.feedback_time < 500):
+            color = (0, 255, 0) if self.session.feedback == self.localization.get_text("correct") else (255, 0, 0)
+            self.draw_text(self.session.feedback, self.small_font, color, 
                          (self.SCREEN_WIDTH / 2, self.SCREEN_HEIGHT * 0.6))
 
+    def session_summary(self) -> Dict:
+        return {
+            "type": "session",
+            "station": self.label,
+            "session_id": self.session.session_id,
+            "seed": self.session.seed,
+            "language": self.localization.current_language,
+            "trial_count": self.config.trial_count,
+            "score": self.session.score,
+            "correct_clicks": self.session.correct_clicks,
+            "incorrect_clicks": self.session.incorrect_clicks,
+            "avg_time": self.session.avg_time,
+            "timestamp": time.time()
+        }
+
+    def freeze_results(self) -> None:
+        lines = [
+            (self.localization.get_text("avg_time").format(avg_time=self.session.avg_time), 0.3),
+            (self.localization.get_text("coefficient").format(coefficient=self.session.coefficient), 0.4),
+            (self.localization.get_text("accuracy").format(accuracy=self.session.accuracy), 0.5)
+        ]
+        self.results_view = []
+        for text, y in lines:
+            surface = self.font.render(text, True, (0, 0, 0))
+            self.results_view.append((text, surface, surface.get_rect(center=(self.SCREEN_WIDTH / 2, self.SCREEN_HEIGHT * y))))
+
     def render_results(self) -> None:
-        avg_time = (sum(self.stroop_data["reaction_times"]) / 
-                   len(self.stroop_data["reaction_times"])) if self.stroop_data["reaction_times"] else 0
-        coefficient = 1 / avg_time if avg_time > 0 else 0
-        total_clicks = self.stroop_data["correct_clicks"] + self.stroop_data["incorrect_clicks"]
-        accuracy = (self.stroop_data["correct_clicks"] / total_clicks * 100) if total_clicks > 0 else 0
-        
-        self.draw_text(self.localization.get_text("avg_time").format(avg_time=avg_time), 
-                      self.font, (0, 0, 0), (self.SCREEN_WIDTH / 2, self.SCREEN_HEIGHT * 0.3))
-        self.draw_text(self.localization.get_text("coefficient").format(coefficient=coefficient), 
-                      self.font, (0, 0, 0), (self.SCREEN_WIDTH / 2, self.SCREEN_HEIGHT * 0.4))
-        self.draw_text(self.localization.get_text("accuracy").format(accuracy=accuracy), 
-                      self.font, (0, 0, 0), (self.SCREEN_WIDTH / 2, self.SCREEN_HEIGHT * 0.5))
+        for text, surface, rect in self.results_view:
+            self.screen.blit(surface, rect)
+            self.mark_dirty(rect, text)
         self.render_buttons(self.buttons["results"])
 
     def draw_text(self, text: str, font: pygame.font.Font, color: Tuple[int, int, int], 
                  pos: Tuple[int, int]) -> None:
-        surface = font.render(text, True, color)
+        surface = self.text_cache.render(font, text, color)
         rect = surface.get_rect(center=pos)
         self.screen.blit(surface, rect)
-
-    def draw_square(self, color_name: str, pos: Tuple[int, int]) -> None:
-        size = int(self.config.square_size * self.SCALE_FACTOR)
-        square = pygame.Surface((size, size))
-        square.fill(self.localization.colors[color_name])
-        rect = square.get_rect(center=pos)
-        self.screen.blit(square, rect)
+        self.mark_dirty(rect, (text, color))
+
+    def ensure_atlas(self) -> StimulusAtlas:
+        font = self.font
+        language = self.localization.current_language
+        if (self.atlas is None or self.atlas.font is not font or self.atlas.language != language or
+                self.atlas.palette is not self.localization.colors):
+            self.atlas = StimulusAtlas(font, self.localization.colors, self.localization.get_color_name,
+                                       int(self.config.square_size * self.SCALE_FACTOR), language)
+        return self.atlas
+
+    def create_schedule(self) -> TrialSchedule:
+        return TrialSchedule(list(self.localization.colors.keys()), self.config.trial_count,
+                             seed=self.replay_seeds.popleft() if self.replay_seeds else self.config.seed,
+                             congruent_ratio=self.config.congruent_ratio,
+                             no_immediate_repeats=self.config.no_immediate_repeats,
+                             trial_types=self.trial_types)
 
     def reset_game(self) -> None:
-        self.stroop_data = self.create_stroop_data()
+        if self.memory is not None:
+            self.memory.on_reset()
+        self.ensure_color_layout()
+        self.ensure_atlas()
+        self.session.reset(self.config.trial_count, (self.SCREEN_WIDTH / 2, self.SCREEN_HEIGHT / 2))
+        self.schedule = self.create_schedule()
+        self.session.seed = self.schedule.seed
+        if self.recorder is not None:
+            self.recorder.record_seed(self.schedule.seed)
+        self.session.session_id = uuid.uuid4().hex
+        if self.trial_log is not None:
+            self.trial_log.begin_session({
+                "seed": self.schedule.seed,
+                "session_id": self.session.session_id,
+                "trial_count": self.config.trial_count,
+                "language": self.localization.current_language,
+                "colors": self.schedule.colors,
+                "trial_types": [trial_type.name for trial_type in self.schedule.trial_types],
+                "label": self.label,
+                "started": time.time()
+            })
         self.start_trial()
 
     def start_trial(self) -> None:
-        if self.stroop_data["trials_left"] > 0:
-            self.stroop_data["trials_left"] -= 1
-            color_names = list(self.localization.colors.keys())
+        if self.session.trials_left > 0:
+            self.session.trials_left -= 1
+            plan = self.schedule.parts[self.session.part]
+            index = self.config.trial_count - self.session.trials_left - 1
+            word_key = plan.words[index]
+            x, y = plan.positions[index]
+
+            self.session.word_key = word_key
+            self.session.color = plan.inks[index]
+            self.session.correct_color = plan.correct[index]
+            self.session.position = (self.SCREEN_WIDTH * x, self.SCREEN_HEIGHT * y)
             
-            if self.stroop_data["part"] == 1:
-                color_key = random.choice(color_names)
-                self.stroop_data["word"] = self.localization.get_color_name(color_key)
-                self.stroop_data["color"] = random.choice(color_names)
-                self.stroop_data["correct_color"] = color_key
-                self.stroop_data["position"] = (self.SCREEN_WIDTH / 2, self.SCREEN_HEIGHT / 2)
-            elif self.stroop_data["part"] == 2:
-                self.stroop_data["word"] = ""
-                self.stroop_data["color"] = random.choice(color_names)
-                self.stroop_data["correct_color"] = self.stroop_data["color"]
-                self.stroop_data["position"] = (
-                    self.SCREEN_WIDTH * (0.3 + random.random() * 0.4),
-                    self.SCREEN_HEIGHT * (0.3 + random.random() * 0.4)
-                )
-            elif self.stroop_data["part"] == 3:
-                color_key = random.choice(color_names)
-                self.stroop_data["word"] = self.localization.get_color_name(color_key)
-                self.stroop_data["color"] = random.choice(color_names)
-                self.stroop_data["correct_color"] = self.stroop_data["color"]
-                self.stroop_data["position"] = (
-                    self.SCREEN_WIDTH * (0.3 + random.random() * 0.4),
-                    self.SCREEN_HEIGHT * (0.3 + random.random() * 0.4)
-                )
+            self.render_plan = self.compile_trial()
             
-            self.stroop_data["start_time"] = pygame.time.get_ticks()
-            self.update_color_buttons()
+            self.session.start_time = self.frame_ticks
+            self.timer.arm()
+            self.color_layout.arrange(plan.button_orders[index])
         else:
-            self.stroop_data["part"] += 1
-            if self.stroop_data["part"] <= 3:
-                self.stroop_data["trials_left"] = self.config.trial_count
+            self.session.part += 1
+            if self.session.part <= len(self.schedule.parts):
+                self.session.trials_left = self.config.trial_count
                 self.start_trial()
             else:
                 self.set_state("results")
 
-    def update_color_buttons(self) -> None:
-        button_width = int(self.config.button_width * self.SCALE_FACTOR)
-        button_height = int(self.config.button_height * self.SCALE_FACTOR)
-        total_buttons = len(self.localization.colors)
-        total_width = total_buttons * button_width + (total_buttons - 1) * self.config.button_spacing
-        start_x = (self.SCREEN_WIDTH - total_width) / 2
-        
-        color_names = list(self.localization.colors.keys())
-        random.shuffle(color_names)
-        
-        self.buttons["color"] = [
-            Button(name, 
-                  pygame.Rect(start_x + i * (button_width + self.config.button_spacing),
-                            self.SCREEN_HEIGHT * 0.75, button_width, button_height),
-                  lambda c=name: self.check_color(c),
-                  self.localization.colors[name])
-            for i, name in enumerate(color_names)
-        ]
+    def invalidate_render_plans(self) -> None:
+        self.palette = self.localization.colors
+        self.render_generation += 1
+
+    def compile_trial(self) -> RenderPlan:
+        trial_type = self.schedule.trial_types[self.session.part - 1]
+        self.plan_generation = self.render_generation
+        return trial_type.compile(self.ensure_atlas(), self.session.word_key, self.session.color,
+                                  self.session.correct_color, self.session.position)
 
     def check_color(self, color: str) -> None:
         if self.state == "game":
-            if color == self.stroop_data["correct_color"]:
-                reaction_time = (pygame.time.get_ticks() - self.stroop_data["start_time"]) / 1000.0
-                self.stroop_data["reaction_times"].append(reaction_time)
-                self.stroop_data["score"] += 10
-                self.stroop_data["total_time"] += reaction_time
-                self.stroop_data["correct_clicks"] += 1
-                self.stroop_data["feedback"] = self.localization.get_text("correct")
-            else:
-                self.stroop_data["score"] -= 5
-                self.stroop_data["incorrect_clicks"] += 1
-                self.stroop_data["feedback"] = self.localization.get_text("incorrect")
-            
-            self.stroop_data["feedback_time"] = pygame.time.get_ticks()
-            self.update_color_buttons()
+            is_correct = color == self.render_plan.correct
+            if self.trial_log is not None:
+                self.trial_log.record(self.session.part, self.session.word_key,
+                                      self.session.color, self.session.correct_color, color,
+                                      self.timer.onset_ns or 0, self.timer.response_ns or 0, is_correct)
+            reaction_time = (self.frame_ticks - self.session.start_time) / 1000.0
+            precise_time = self.timer.reaction_time()
+            self.session.record_response(is_correct, reaction_time,
+                                         precise_time if precise_time is not None else math.nan)
+            self.session.feedback = self.localization.get_text("correct" if is_correct else "incorrect")
+            self.session.feedback_time = self.frame_ticks
+            if self.collector is not None:
+                self.collector.submit({
+                    "type": "trial",
+                    "station": self.label,
+                    "session_id": self.session.session_id,
+                    "part": self.session.part,
+                    "word": self.session.word_key,
+                    "ink": self.session.color,
+                    "correct": self.session.correct_color,
+                    "response": color,
+                    "is_correct": is_correct,
+                    "reaction_time": precise_time,
+                    "timestamp": time.time()
+                })
             self.start_trial()
 
     def change_language(self, lang: str) -> None:
         self.localization.set_language(lang)
+        self.text_cache.clear()
+        self.atlas = None
+        self.invalidate_render_plans()
         self.config.language = lang
-        self.config.save()
+        self.save_config()
         self.set_state("settings")
 
+    def save_config(self) -> None:
+        if self.persist_config:
+            self.config.save()
+
+    def display_flags(self) -> int:
+        if self.config.display_mode == "fullscreen":
+            return pygame.FULLSCREEN
+        if self.config.display_mode == "noframe":
+            return pygame.NOFRAME
+        return 0
+
+    def store_layout(self) -> None:
+        self.layouts[(self.SCREEN_WIDTH, self.SCREEN_HEIGHT)] = (self.buttons, self.color_layout, self.atlas)
+
+    def load_layout(self) -> None:
+        cached = self.layouts.get((self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
+        if cached is None:
+            self.buttons = self.create_buttons()
+            self.atlas = None
+        else:
+            self.buttons, self.color_layout, self.atlas = cached
+
     def change_resolution(self, width: int, height: int) -> None:
-        self.SCREEN_WIDTH, self.SCREEN_HEIGHT = width, height
-        self.SCALE_FACTOR = min(self.SCREEN_WIDTH / 1920, self.SCREEN_HEIGHT / 1080)
-        self.config.screen_width, self.config.screen_height = width, height
-        
+        if not self.owns_display:
+            self.set_state("settings")
+            return
+        flags = self.display_flags()
+        if self.screen.get_size() == (width, height) and self.mode_flags == flags:
+            self.set_state("settings")
+            return
+
+        self.store_layout()
         try:
-            if self.config.display_mode == "fullscreen":
-                flags = pygame.FULLSCREEN
-            elif self.config.display_mode == "noframe":
-                flags = pygame.NOFRAME
-            else:
-                flags = 0
-            
             self.screen = pygame.display.set_mode((width, height), flags)
-            self.font = pygame.font.Font(None, int(self.config.font_size * self.SCALE_FACTOR))
-            self.small_font = pygame.font.Font(None, int(self.config.small_font_size * self.SCALE_FACTOR))
-            self.buttons = self.create_buttons()
+            self.config.screen_width, self.config.screen_height = width, height
         except pygame.error:
             self.screen = pygame.display.set_mode((1280, 720), 0)
-            self.SCREEN_WIDTH, self.SCREEN_HEIGHT = 1280, 720
             self.config.screen_width, self.config.screen_height = 1280, 720
             self.config.display_mode = "windowed"
-        
-        self.config.save()
+        self.mode_flags = self.display_flags()
+        self.SCREEN_WIDTH, self.SCREEN_HEIGHT = self.screen.get_size()
+        self.SCALE_FACTOR = min(self.SCREEN_WIDTH / 1920, self.SCREEN_HEIGHT / 1080)
+        self.load_layout()
+        self.invalidate_render_plans()
+
+        if self.dirty_rects is not None:
+            self.dirty_rects.invalidate()
+        if self.profiler is not None:
+            self.profiler.event("change_resolution")
+        self.save_config()
         self.set_state("settings")
 
     def change_display_mode(self, mode: str) -> None:
         self.config.display_mode = mode
-        self.config.save()
         self.change_resolution(self.SCREEN_WIDTH, self.SCREEN_HEIGHT)
 
 def main():
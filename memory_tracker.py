@@ -0,0 +1,107 @@
+import json
+import tracemalloc
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+from streaming_stats import RunningStats
+
+class MemoryTracker:
+    def __init__(self, frame_interval: int = 600, top: int = 10, trace_frames: int = 1,
+                 growth_threshold: int = 64 * 1024, history: int = 100):
+        self.frame_interval = frame_interval
+        self.top = top
+        self.growth_threshold = growth_threshold
+        self.frame = 0
+        self.snapshots: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self.frame_deltas = RunningStats()
+        self.reset_baselines: List[int] = []
+        self.growth_warnings: List[Dict[str, Any]] = []
+        self._owns_tracing = not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start(trace_frames)
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._previous_frame = 0
+        self._reset_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._last_traced = tracemalloc.get_traced_memory()[0]
+
+    def _take(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>")
+        ))
+
+    def _top_sites(self, stats: List[tracemalloc.StatisticDiff]) -> List[Dict[str, Any]]:
+        return [{
+            "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_diff": stat.size_diff,
+            "count_diff": stat.count_diff,
+            "size": stat.size
+        } for stat in stats[:self.top] if stat.size_diff or stat.count_diff]
+
+    def snapshot(self, label: str) -> None:
+        snapshot = self._take()
+        current, peak = tracemalloc.get_traced_memory()
+        entry: Dict[str, Any] = {"label": label, "frame": self.frame, "traced_bytes": current, "peak_bytes": peak}
+        if self._previous is not None:
+            stats = snapshot.compare_to(self._previous, "lineno")
+            blocks = sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+            entry["new_blocks"] = blocks
+            entry["new_blocks_per_frame"] = blocks / max(1, self.frame - self._previous_frame)
+            entry["top_sites"] = self._top_sites(stats)
+        self._previous = snapshot
+        self._previous_frame = self.frame
+        self.snapshots.append(entry)
+
+    def end_frame(self) -> None:
+        current = tracemalloc.get_traced_memory()[0]
+        self.frame_deltas.add(current - self._last_traced)
+        self._last_traced = current
+        self.frame += 1
+        if self.frame_interval and self.frame % self.frame_interval == 0:
+            self.snapshot("frame")
+
+    def on_reset(self) -> None:
+        snapshot = self._take()
+        current = tracemalloc.get_traced_memory()[0]
+        self.reset_baselines.append(current)
+        cycle = len(self.reset_baselines)
+        if self._reset_snapshot is not None and cycle > 2:
+            growth = current - self.reset_baselines[-2]
+            if growth > self.growth_threshold:
+                sites = self._top_sites(snapshot.compare_to(self._reset_snapshot, "lineno"))
+                self.growth_warnings.append({"cycle": cycle, "frame": self.frame, "growth_bytes": growth,
+                                             "top_sites": sites})
+                print(f"Warning: Memory grew by {growth} bytes over reset_game cycle {cycle}"
+                      + (f", mostly at {sites[0]['site']}" if sites else ""))
+        self._reset_snapshot = snapshot
+
+    def report(self) -> Dict[str, Any]:
+        baselines = self.reset_baselines
+        return {
+            "frames": self.frame,
+            "frame_delta_bytes": {
+                "mean": self.frame_deltas.mean,
+                "sd": self.frame_deltas.stdev,
+                "min": self.frame_deltas.minimum if self.frame_deltas.count else 0,
+                "max": self.frame_deltas.maximum if self.frame_deltas.count else 0
+            },
+            "traced_bytes": tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0,
+            "reset_baselines": baselines,
+            "steady_state_growth_bytes": baselines[-1] - baselines[1] if len(baselines) > 2 else 0,
+            "growth_warnings": self.growth_warnings,
+            "snapshots": list(self.snapshots)
+        }
+
+    def dump(self, path: Optional[str]) -> None:
+        if not path:
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, indent=4)
+        except Exception as e:
+            print(f"Error saving memory report: {e}")
+
+    def stop(self) -> None:
+        if self._owns_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
\ No newline at end of file
@@ -0,0 +1,112 @@
+import json
+import time
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+class FrameProfiler:
+    BUCKET_EDGES_MS = (4, 8, 12, 16, 20, 25, 33, 50, 100)
+
+    def __init__(self, fps: int = 60, spike_factor: float = 1.5, history: int = 600):
+        self.budget_ms = 1000.0 / fps
+        self.spike_factor = spike_factor
+        self.frame = 0
+        self.phase_totals: Dict[str, float] = {}
+        self.phase_counts: Dict[str, int] = {}
+        self.phase_max: Dict[str, float] = {}
+        self.histogram = [0] * (len(self.BUCKET_EDGES_MS) + 1)
+        self.dropped_frames = 0
+        self.frame_times: Deque[float] = deque(maxlen=history)
+        self.events: Deque[Tuple[int, str]] = deque(maxlen=history)
+        self.spikes: Deque[Tuple[int, float, List[str]]] = deque(maxlen=history)
+        self.spike_causes: Counter = Counter()
+        self.overlay_visible = True
+        self._frame_start = 0.0
+        self._lap_start = 0.0
+        self._wait_ms = 0.0
+        self._frame_events: List[str] = []
+        self._previous_events: List[str] = []
+
+    def begin_frame(self) -> None:
+        self._frame_start = self._lap_start = time.perf_counter()
+        self._wait_ms = 0.0
+
+    def lap(self, phase: str, wait: bool = False) -> None:
+        now = time.perf_counter()
+        elapsed = (now - self._lap_start) * 1000
+        self._lap_start = now
+        if wait:
+            self._wait_ms += elapsed
+        self.phase_totals[phase] = self.phase_totals.get(phase, 0.0) + elapsed
+        self.phase_counts[phase] = self.phase_counts.get(phase, 0) + 1
+        if elapsed > self.phase_max.get(phase, 0.0):
+            self.phase_max[phase] = elapsed
+
+    def event(self, name: str) -> None:
+        self._frame_events.append(name)
+        self.events.append((self.frame, name))
+
+    def end_frame(self, idle: bool = False) -> None:
+        frame_ms = (time.perf_counter() - self._frame_start) * 1000
+        if idle:
+            frame_ms -= self._wait_ms
+        self.frame_times.append(frame_ms)
+        bucket = 0
+        while bucket < len(self.BUCKET_EDGES_MS) and frame_ms >= self.BUCKET_EDGES_MS[bucket]:
+            bucket += 1
+        self.histogram[bucket] += 1
+
+        if frame_ms > self.budget_ms * self.spike_factor:
+            self.dropped_frames += 1
+            causes = self._frame_events + self._previous_events
+            self.spikes.append((self.frame, frame_ms, causes))
+            self.spike_causes.update(causes or ["unattributed"])
+
+        self._previous_events = self._frame_events
+        self._frame_events = []
+        self.frame += 1
+
+    def percentile(self, pct: float) -> float:
+        if not self.frame_times:
+            return 0.0
+        ordered = sorted(self.frame_times)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def overlay_lines(self) -> List[str]:
+        last = self.frame_times[-1] if self.frame_times else 0.0
+        average = sum(self.frame_times) / len(self.frame_times) if self.frame_times else 0.0
+        fps = 1000.0 / average if average > 0 else 0.0
+        return [
+            f"{fps:.0f} fps  frame {last:.1f} ms  p95 {self.percentile(95):.1f} ms",
+            f"dropped {self.dropped_frames} / {self.frame}"
+        ]
+
+    def report(self) -> Dict[str, Any]:
+        labels = [f"<{edge}ms" for edge in self.BUCKET_EDGES_MS] + [f">={self.BUCKET_EDGES_MS[-1]}ms"]
+        return {
+            "frames": self.frame,
+            "budget_ms": self.budget_ms,
+            "dropped_frames": self.dropped_frames,
+            "frame_ms_p50": self.percentile(50),
+            "frame_ms_p95": self.percentile(95),
+            "frame_ms_p99": self.percentile(99),
+            "histogram": dict(zip(labels, self.histogram)),
+            "phases": {
+                phase: {
+                    "mean_ms": self.phase_totals[phase] / self.phase_counts[phase],
+                    "max_ms": self.phase_max[phase],
+                    "calls": self.phase_counts[phase]
+                }
+                for phase in self.phase_totals
+            },
+            "spike_causes": dict(self.spike_causes),
+            "recent_spikes": [{"frame": f, "ms": ms, "events": causes} for f, ms, causes in self.spikes]
+        }
+
+    def dump(self, path: Optional[str]) -> None:
+        if not path:
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, indent=4)
+        except Exception as e:
+            print(f"Error saving profile: {e}")
\ No newline at end of file
@@ -0,0 +1,81 @@
+import json
+from typing import Any, Dict, List, Sequence, Tuple
+import pygame
+
+RECORDED_EVENTS = (pygame.QUIT, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION,
+                   pygame.KEYDOWN, pygame.KEYUP)
+KEY_EVENTS = (pygame.KEYDOWN, pygame.KEYUP)
+RECORDING_VERSION = 2
+
+def encode_event(event: pygame.event.Event) -> List[int]:
+    x, y = getattr(event, "pos", (0, 0))
+    return [event.type, x, y, getattr(event, "button", 0), getattr(event, "key", 0)]
+
+def decode_event(data: Sequence[int]) -> pygame.event.Event:
+    event_type, x, y, button, key = data
+    if event_type in KEY_EVENTS:
+        return pygame.event.Event(event_type, key=key)
+    if event_type == pygame.QUIT:
+        return pygame.event.Event(event_type)
+    return pygame.event.Event(event_type, pos=(x, y), button=button)
+
+def session_outcome(session) -> Dict[str, Any]:
+    return {
+        "seed": session.seed,
+        "score": session.score,
+        "correct_clicks": session.correct_clicks,
+        "incorrect_clicks": session.incorrect_clicks,
+        "total_time": session.total_time,
+        "parts": session.part_summaries(precise=False)
+    }
+
+class InputRecorder:
+    def __init__(self, config: Dict[str, Any], screen_size: Tuple[int, int]):
+        self.config = config
+        self.screen_size = list(screen_size)
+        self.seeds: List[int] = []
+        self.timeline: List[List[Any]] = []
+        self.transitions: List[List[Any]] = []
+        self.results: List[Dict[str, Any]] = []
+
+    def record_input(self, ticks: int, events: List[pygame.event.Event]) -> None:
+        encoded = [encode_event(event) for event in events if event.type in RECORDED_EVENTS]
+        if encoded:
+            self.timeline.append(["input", ticks, encoded])
+
+    def record_update(self, ticks: int) -> None:
+        self.timeline.append(["update", ticks])
+
+    def record_seed(self, seed: int) -> None:
+        self.seeds.append(seed)
+
+    def record_transition(self, state: str, ticks: int) -> None:
+        self.transitions.append([state, ticks])
+
+    def record_result(self, session) -> None:
+        self.results.append(session_outcome(session))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": RECORDING_VERSION,
+            "config": self.config,
+            "screen_size": self.screen_size,
+            "seeds": self.seeds,
+            "timeline": self.timeline,
+            "transitions": self.transitions,
+            "results": self.results
+        }
+
+    def save(self, path: str) -> None:
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, separators=(",", ":"))
+        except Exception as e:
+            print(f"Error saving input recording: {e}")
+
+def load_recording(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        recording = json.load(f)
+    if recording.get("version") != RECORDING_VERSION:
+        raise ValueError(f"unsupported recording version in {path}")
+    return recording
\ No newline at end of file
@@ -0,0 +1,123 @@
+import argparse
+import asyncio
+import dataclasses
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+from main import GameConfig, StroopTest
+from recording import InputRecorder, decode_event, load_recording
+
+class VirtualClock:
+    def __init__(self, now: int = 0):
+        self.now = now
+
+    def __call__(self) -> int:
+        return self.now
+
+class Replayer:
+    def __init__(self, recording: Dict[str, Any], render: bool = True):
+        self.recording = recording
+        self.render = render
+        self.render_times: List[float] = []
+
+    def create_game(self) -> StroopTest:
+        width, height = self.recording["screen_size"]
+        config = dataclasses.replace(GameConfig.from_dict(self.recording["config"]),
+                                     screen_width=width, screen_height=height, display_mode="windowed",
+                                     record_trials=False, profile=False, memory_tracking=False,
+                                     collector="", record_input="")
+        game = StroopTest(config, persist_config=False)
+        game.get_ticks = VirtualClock()
+        game.replay_seeds.extend(self.recording["seeds"])
+        game.recorder = InputRecorder(self.recording["config"], game.screen.get_size())
+        return game
+
+    def apply(self, game: StroopTest, entry: List[Any]) -> None:
+        game.get_ticks.now = entry[1]
+        if entry[0] == "input":
+            game.handle_events([decode_event(data) for data in entry[2]])
+        else:
+            game.update()
+        if self.render and game.running:
+            started = time.perf_counter()
+            game.render()
+            self.render_times.append(time.perf_counter() - started)
+
+    def replay(self) -> Dict[str, Any]:
+        game = self.create_game()
+        started = time.perf_counter()
+        for entry in self.recording["timeline"]:
+            if not game.running:
+                break
+            self.apply(game, entry)
+        return self.finish(game, started)
+
+    async def replay_realtime(self) -> Dict[str, Any]:
+        game = self.create_game()
+        timeline = self.recording["timeline"]
+        origin = timeline[0][1] if timeline else 0
+        started = time.perf_counter()
+        for entry in timeline:
+            if not game.running:
+                break
+            while True:
+                elapsed = int((time.perf_counter() - started) * 1000) + origin
+                if elapsed >= entry[1]:
+                    break
+                game.get_ticks.now = elapsed
+                game.render()
+                await asyncio.sleep(min(1 / game.FPS, (entry[1] - elapsed) / 1000))
+            self.apply(game, entry)
+        return self.finish(game, started)
+
+    def finish(self, game: StroopTest, started: float) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - started
+        replayed = game.recorder
+        game.shutdown()
+        mismatches = []
+        if replayed.transitions != self.recording["transitions"]:
+            mismatches.append("transitions")
+        if replayed.results != self.recording["results"]:
+            mismatches.append("results")
+        entries = len(self.recording["timeline"])
+        return {
+            "entries": entries,
+            "sessions": len(replayed.results),
+            "elapsed_sec": elapsed,
+            "entries_per_sec": entries / elapsed if elapsed > 0 else 0.0,
+            "render_ms_mean": statistics.fmean(self.render_times) * 1000 if self.render_times else 0.0,
+            "render_ms_max": max(self.render_times, default=0.0) * 1000,
+            "identical": not mismatches,
+            "mismatches": mismatches
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded Stroop Test sessions and verify the outcome")
+    parser.add_argument("recordings", nargs="+")
+    parser.add_argument("--realtime", action="store_true", help="replay at recorded speed in a visible window")
+    parser.add_argument("--no-render", action="store_true", help="skip rendering between inputs")
+    parser.add_argument("--output", default="")
+    args = parser.parse_args()
+
+    if not args.realtime:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    reports = {}
+    for path in args.recordings:
+        replayer = Replayer(load_recording(path), render=not args.no_render)
+        reports[path] = asyncio.run(replayer.replay_realtime()) if args.realtime else replayer.replay()
+        print(f"{path}: {'identical' if reports[path]['identical'] else 'MISMATCH'} "
+              f"({reports[path]['entries_per_sec']:.0f} entries/s)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=4)
+    if not all(report["identical"] for report in reports.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,15 @@
+from typing import Dict
+import pygame
+from text_cache import TextCache
+
+class SharedResources:
+    def __init__(self, text_cache_size: int = 256):
+        self.text_cache = TextCache(text_cache_size)
+        self._fonts: Dict[int, pygame.font.Font] = {}
+
+    def font(self, size: int) -> pygame.font.Font:
+        font = self._fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(None, size)
+            self._fonts[size] = font
+        return font
\ No newline at end of file
@@ -0,0 +1,66 @@
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+from trial_types import DEFAULT_TRIAL_TYPES, TrialType, resolve_trial_types
+
+@dataclass
+class PartSchedule:
+    words: List[str] = field(default_factory=list)
+    inks: List[str] = field(default_factory=list)
+    correct: List[str] = field(default_factory=list)
+    positions: List[Tuple[float, float]] = field(default_factory=list)
+    button_orders: List[List[str]] = field(default_factory=list)
+
+class TrialSchedule:
+    def __init__(self, colors: Sequence[str], trial_count: int, seed: Optional[int] = None,
+                 congruent_ratio: Optional[float] = None, no_immediate_repeats: bool = False,
+                 trial_types: Optional[Sequence[TrialType]] = None):
+        if not colors:
+            raise ValueError("Trial schedule needs at least one color")
+        if congruent_ratio is not None and not 0.0 <= congruent_ratio <= 1.0:
+            raise ValueError("congruent_ratio must be between 0 and 1")
+
+        self.colors = list(colors)
+        self.trial_count = trial_count
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2 ** 32)
+        self.congruent_ratio = congruent_ratio
+        self.no_immediate_repeats = no_immediate_repeats and len(self.colors) > 1
+        self.trial_types = list(trial_types) if trial_types is not None else resolve_trial_types(DEFAULT_TRIAL_TYPES)
+
+        rng = random.Random(self.seed)
+        self.parts: Dict[int, PartSchedule] = {
+            part: self._generate_part(rng, trial_type) for part, trial_type in enumerate(self.trial_types, 1)
+        }
+
+    def _draw_targets(self, rng: random.Random) -> List[str]:
+        targets: List[str] = []
+        for _ in range(self.trial_count):
+            choices = self.colors
+            if self.no_immediate_repeats and targets:
+                choices = [c for c in self.colors if c != targets[-1]]
+            targets.append(rng.choice(choices))
+        return targets
+
+    def draw_distractors(self, rng: random.Random, targets: List[str]) -> List[str]:
+        if self.congruent_ratio is None:
+            return [rng.choice(self.colors) for _ in targets]
+
+        congruent_count = round(self.congruent_ratio * len(targets))
+        congruent = [True] * congruent_count + [False] * (len(targets) - congruent_count)
+        rng.shuffle(congruent)
+        distractors = []
+        for target, is_congruent in zip(targets, congruent):
+            others = [c for c in self.colors if c != target]
+            distractors.append(target if is_congruent or not others else rng.choice(others))
+        return distractors
+
+    def draw_positions(self, rng: random.Random) -> List[Tuple[float, float]]:
+        return [(0.3 + rng.random() * 0.4, 0.3 + rng.random() * 0.4) for _ in range(self.trial_count)]
+
+    def _generate_part(self, rng: random.Random, trial_type: TrialType) -> PartSchedule:
+        schedule = PartSchedule()
+        targets = self._draw_targets(rng)
+        schedule.correct = targets
+        schedule.words, schedule.inks, schedule.positions = trial_type.generate(self, rng, targets)
+        schedule.button_orders = [rng.sample(self.colors, len(self.colors)) for _ in range(self.trial_count)]
+        return schedule
\ No newline at end of file
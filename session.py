@@ -0,0 +1,114 @@
+import math
+from typing import Any, Dict, List, Tuple
+from streaming_stats import QuantileSketch, RunningStats
+
+CORRECT_SCORE = 10
+INCORRECT_SCORE = -5
+
+class PartTrials:
+    __slots__ = ("reaction_times", "reaction_quantiles", "precise_times", "timing_bias", "correct_clicks",
+                 "incorrect_clicks")
+
+    def __init__(self):
+        self.reaction_times = RunningStats()
+        self.reaction_quantiles = QuantileSketch()
+        self.precise_times = RunningStats()
+        self.timing_bias = RunningStats()
+        self.correct_clicks = 0
+        self.incorrect_clicks = 0
+
+    def reset(self) -> None:
+        self.reaction_times.reset()
+        self.reaction_quantiles.reset()
+        self.precise_times.reset()
+        self.timing_bias.reset()
+        self.correct_clicks = 0
+        self.incorrect_clicks = 0
+
+    def add_correct(self, reaction_time: float, precise_time: float) -> None:
+        self.reaction_times.add(reaction_time)
+        self.reaction_quantiles.add(reaction_time)
+        if not math.isnan(precise_time):
+            self.precise_times.add(precise_time)
+            self.timing_bias.add(reaction_time - precise_time)
+        self.correct_clicks += 1
+
+    def summary(self, precise: bool = True) -> Dict[str, Any]:
+        summary = {
+            "correct_clicks": self.correct_clicks,
+            "incorrect_clicks": self.incorrect_clicks,
+            "mean_rt": self.reaction_times.mean,
+            "sd_rt": self.reaction_times.stdev,
+            "median_rt": self.reaction_quantiles.quantile(0.5),
+            "p90_rt": self.reaction_quantiles.quantile(0.9)
+        }
+        if precise:
+            summary.update({
+                "precise_trials": self.precise_times.count,
+                "precise_mean_rt": self.precise_times.mean,
+                "precise_sd_rt": self.precise_times.stdev,
+                "timing_bias_mean": self.timing_bias.mean,
+                "timing_bias_sd": self.timing_bias.stdev
+            })
+        return summary
+
+class StroopSession:
+    __slots__ = ("part", "trials_left", "word_key", "color", "correct_color", "position",
+                 "start_time", "parts", "correct_clicks", "incorrect_clicks", "feedback", "feedback_time",
+                 "score", "total_time", "seed", "session_id")
+
+    def __init__(self, trial_count: int, position: Tuple[float, float], part_count: int = 3):
+        self.parts: List[PartTrials] = [PartTrials() for _ in range(part_count)]
+        self.reset(trial_count, position)
+
+    def reset(self, trial_count: int, position: Tuple[float, float]) -> None:
+        self.part = 1
+        self.trials_left = trial_count
+        self.word_key = ""
+        self.color = ""
+        self.correct_color = ""
+        self.position = position
+        self.start_time = 0
+        self.correct_clicks = 0
+        self.incorrect_clicks = 0
+        self.feedback = ""
+        self.feedback_time = 0
+        self.score = 0
+        self.total_time = 0.0
+        self.seed = None
+        self.session_id = ""
+        for part in self.parts:
+            part.reset()
+
+    @property
+    def current(self) -> PartTrials:
+        return self.parts[self.part - 1]
+
+    def record_response(self, is_correct: bool, reaction_time: float, precise_time: float = math.nan) -> None:
+        trials = self.current
+        if is_correct:
+            trials.add_correct(reaction_time, precise_time)
+            self.correct_clicks += 1
+            self.score += CORRECT_SCORE
+            self.total_time += reaction_time
+        else:
+            trials.incorrect_clicks += 1
+            self.incorrect_clicks += 1
+            self.score += INCORRECT_SCORE
+
+    def part_summaries(self, precise: bool = True) -> List[Dict[str, Any]]:
+        return [part.summary(precise) for part in self.parts]
+
+    @property
+    def avg_time(self) -> float:
+        return self.total_time / self.correct_clicks if self.correct_clicks > 0 else 0.0
+
+    @property
+    def coefficient(self) -> float:
+        avg_time = self.avg_time
+        return 1 / avg_time if avg_time > 0 else 0.0
+
+    @property
+    def accuracy(self) -> float:
+        total_clicks = self.correct_clicks + self.incorrect_clicks
+        return self.correct_clicks / total_clicks * 100 if total_clicks > 0 else 0.0
\ No newline at end of file
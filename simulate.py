@@ -0,0 +1,208 @@
+import argparse
+import json
+import math
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from localization import Localization
+from schedule import TrialSchedule
+from session import StroopSession
+from streaming_stats import QuantileSketch, RunningStats
+
+METRICS = ("score", "avg_time", "coefficient", "accuracy", "interference")
+
+@dataclass
+class ParticipantModel:
+    name: str = "typical"
+    base_rt: float = 0.6
+    naming_factor: float = 1.15
+    sigma: float = 0.25
+    tail: float = 0.1
+    interference: float = 0.15
+    reverse_interference: float = 0.02
+    error_rate: float = 0.02
+    incongruent_error_rate: float = 0.04
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ParticipantModel':
+        known = {field.name for field in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"Unknown participant model keys: {', '.join(sorted(unknown))}")
+        return cls(**data)
+
+    def respond(self, rng: random.Random, part: int, word: str, ink: str) -> Tuple[float, bool]:
+        incongruent = part != 2 and word != ink
+        reaction_time = self.base_rt * (self.naming_factor if part > 1 else 1.0)
+        reaction_time *= rng.lognormvariate(0.0, self.sigma)
+        reaction_time += rng.expovariate(1 / self.tail) if self.tail > 0 else 0.0
+        error_rate = self.error_rate
+        if incongruent and part == 3:
+            reaction_time += self.interference
+            error_rate += self.incongruent_error_rate
+        elif incongruent:
+            reaction_time += self.reverse_interference
+        return reaction_time, rng.random() >= error_rate
+
+class SimulationSummary:
+    def __init__(self):
+        self.sessions = 0
+        self.stats = {metric: RunningStats() for metric in METRICS}
+        self.sketches = {metric: QuantileSketch() for metric in METRICS}
+        self.scores: Counter = Counter()
+
+    def add(self, session: StroopSession) -> None:
+        first, third = session.parts[0].precise_times, session.parts[2].precise_times
+        values = {
+            "score": session.score,
+            "avg_time": session.avg_time,
+            "coefficient": session.coefficient,
+            "accuracy": session.accuracy,
+            "interference": third.mean - first.mean if first.count and third.count else math.nan
+        }
+        self.sessions += 1
+        self.scores[session.score] += 1
+        for metric, value in values.items():
+            if not math.isnan(value):
+                self.stats[metric].add(value)
+                self.sketches[metric].add(value)
+
+    def merge(self, other: 'SimulationSummary') -> None:
+        self.sessions += other.sessions
+        self.scores.update(other.scores)
+        for metric in METRICS:
+            self.stats[metric].merge(other.stats[metric])
+            self.sketches[metric].merge(other.sketches[metric])
+
+    def score_quantile(self, q: float) -> float:
+        rank = q * (sum(self.scores.values()) - 1)
+        seen = 0
+        for score in sorted(self.scores):
+            seen += self.scores[score]
+            if seen > rank:
+                return score
+        return 0
+
+    def report(self) -> Dict[str, Any]:
+        metrics = {}
+        for metric in METRICS:
+            stats, sketch = self.stats[metric], self.sketches[metric]
+            low, high = (stats.minimum, stats.maximum) if stats.count else (0.0, 0.0)
+            if metric == "score":
+                quantile = self.score_quantile
+            else:
+                quantile = lambda q: min(max(sketch.quantile(q), low), high)
+            metrics[metric] = {
+                "mean": stats.mean,
+                "sd": stats.stdev,
+                "min": low,
+                "max": high,
+                "p5": quantile(0.05),
+                "p50": quantile(0.5),
+                "p95": quantile(0.95)
+            }
+        return {
+            "sessions": self.sessions,
+            "metrics": metrics,
+            "score_distribution": {str(score): count for score, count in sorted(self.scores.items())}
+        }
+
+def simulate_session(session: StroopSession, model: ParticipantModel, colors: Sequence[str], trial_count: int,
+                     rng: random.Random, congruent_ratio: Optional[float], countdown: float) -> None:
+    schedule = TrialSchedule(colors, trial_count, seed=rng.randrange(2 ** 32), congruent_ratio=congruent_ratio)
+    session.reset(trial_count, (0.0, 0.0))
+    session.seed = schedule.seed
+    elapsed_ms = int(countdown * 1000)
+    for part, plan in schedule.parts.items():
+        session.part = part
+        for i in range(trial_count):
+            reaction_time, is_correct = model.respond(rng, part, plan.words[i], plan.inks[i])
+            response_ms = max(1, round(reaction_time * 1000))
+            session.record_response(is_correct, (elapsed_ms + response_ms) / 1000.0, response_ms / 1000.0)
+            elapsed_ms = 0
+
+def simulate_chunk(task: Tuple[Dict[str, Any], List[str], int, int, int, Optional[float], float]) -> SimulationSummary:
+    model_data, colors, trial_count, sessions, seed, congruent_ratio, countdown = task
+    model = ParticipantModel.from_dict(model_data)
+    rng = random.Random(seed)
+    session = StroopSession(trial_count, (0.0, 0.0))
+    summary = SimulationSummary()
+    for _ in range(sessions):
+        simulate_session(session, model, colors, trial_count, rng, congruent_ratio, countdown)
+        summary.add(session)
+    return summary
+
+def run_simulation(models: List[ParticipantModel], trial_counts: List[int], sessions: int,
+                   colors: Optional[List[str]] = None, seed: int = 0, chunk_size: int = 2000,
+                   congruent_ratio: Optional[float] = None, countdown: float = 3.0,
+                   workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    colors = colors if colors is not None else list(Localization().colors)
+    tasks, keys = [], []
+    for model in models:
+        for trial_count in trial_counts:
+            for chunk, start in enumerate(range(0, sessions, chunk_size)):
+                chunk_seed = random.Random(f"{seed}:{model.name}:{trial_count}:{chunk}").randrange(2 ** 32)
+                tasks.append((asdict(model), colors, trial_count, min(chunk_size, sessions - start),
+                              chunk_seed, congruent_ratio, countdown))
+                keys.append((model.name, trial_count))
+
+    summaries: Dict[Tuple[str, int], SimulationSummary] = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for key, summary in zip(keys, pool.map(simulate_chunk, tasks)):
+            if key in summaries:
+                summaries[key].merge(summary)
+            else:
+                summaries[key] = summary
+
+    results = []
+    for (name, trial_count), summary in summaries.items():
+        result = {"model": name, "trial_count": trial_count}
+        result.update(summary.report())
+        results.append(result)
+    return results
+
+def load_models(path: str) -> List[ParticipantModel]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        raise ValueError("models file must contain a JSON list of participant models")
+    return [ParticipantModel.from_dict(item) for item in data]
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo simulation of Stroop Test scoring")
+    parser.add_argument("--sessions", type=int, default=100000, help="simulated sessions per model and trial count")
+    parser.add_argument("--trial-counts", type=int, nargs="+", default=[10])
+    parser.add_argument("--models", default="", help="JSON list of participant models")
+    parser.add_argument("--congruent-ratio", type=float, default=None)
+    parser.add_argument("--countdown", type=float, default=3.0,
+                        help="seconds folded into the first response, as in the game")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default="simulation.json")
+    for field in fields(ParticipantModel):
+        if field.name != "name":
+            parser.add_argument(f"--{field.name.replace('_', '-')}", type=float, default=field.default)
+    args = parser.parse_args()
+
+    if args.models:
+        models = load_models(args.models)
+    else:
+        models = [ParticipantModel(**{field.name: getattr(args, field.name) for field in fields(ParticipantModel)
+                                      if field.name != "name"})]
+
+    started = time.perf_counter()
+    results = run_simulation(models, args.trial_counts, args.sessions, seed=args.seed,
+                             chunk_size=args.chunk_size, congruent_ratio=args.congruent_ratio,
+                             countdown=args.countdown, workers=args.workers)
+    elapsed = time.perf_counter() - started
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4)
+    total = args.sessions * len(models) * len(args.trial_counts)
+    print(f"Simulated {total} sessions in {elapsed:.1f}s ({total / elapsed:.0f} sessions/s) into {args.output}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,146 @@
+import argparse
+import asyncio
+import dataclasses
+import math
+import platform
+from pathlib import Path
+from typing import Dict, List, Optional
+import pygame
+from main import GameConfig, StroopTest, init_subsystems, open_display
+from frame_scheduler import FrameScheduler
+from resources import SharedResources
+
+POINTER_EVENTS = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION)
+
+def session_path(path: str, number: int) -> str:
+    path = Path(path)
+    return str(path.with_name(f"{path.stem}-{number}{path.suffix}"))
+
+class Station:
+    def __init__(self, session_count: int, config: Optional[GameConfig] = None):
+        init_subsystems()
+        self.config = config if config is not None else GameConfig.load()
+        self.screen = self.create_display()
+        self.resources = SharedResources()
+        self.sessions: List[StroopTest] = []
+        self.regions: List[pygame.Rect] = []
+        self.focus: Optional[StroopTest] = None
+        self.running = True
+        self.scheduler = FrameScheduler(60)
+
+        columns = math.ceil(math.sqrt(session_count))
+        rows = math.ceil(session_count / columns)
+        width, height = self.screen.get_size()
+        cell_width, cell_height = width // columns, height // rows
+        for i in range(session_count):
+            region = pygame.Rect((i % columns) * cell_width, (i // columns) * cell_height, cell_width, cell_height)
+            session_config = dataclasses.replace(self.config)
+            if session_config.seed is not None:
+                session_config.seed += i
+            if session_config.record_input:
+                session_config.record_input = session_path(session_config.record_input, i + 1)
+            session_config.profile_output = session_path(session_config.profile_output, i + 1)
+            session_config.memory_output = session_path(session_config.memory_output, i + 1)
+            session = StroopTest(session_config, self.screen.subsurface(region),
+                                 self.resources, label=f"station-{i + 1}")
+            session.scheduler = self.scheduler
+            self.sessions.append(session)
+            self.regions.append(region)
+
+    def create_display(self) -> pygame.Surface:
+        screen = open_display(self.config, pygame.display.Info())
+        pygame.display.set_caption("Stroop Test Station")
+        return screen
+
+    def session_at(self, pos) -> int:
+        for i, region in enumerate(self.regions):
+            if region.collidepoint(pos):
+                return i
+        return -1
+
+    def dispatch(self) -> Dict[StroopTest, bool]:
+        routed: Dict[StroopTest, List[pygame.event.Event]] = {
+            session: [] for session in self.sessions if session.running
+        }
+        for event in self.scheduler.poll_events():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type in POINTER_EVENTS and hasattr(event, "pos"):
+                index = self.session_at(event.pos)
+                if index < 0:
+                    continue
+                session = self.sessions[index]
+                if session not in routed:
+                    continue
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    self.focus = session
+                local = dict(event.dict, pos=(event.pos[0] - self.regions[index].x,
+                                              event.pos[1] - self.regions[index].y))
+                routed[session].append(pygame.event.Event(event.type, local))
+            elif event.type == pygame.KEYDOWN and self.focus in routed:
+                routed[self.focus].append(event)
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                self.running = False
+        return {session: session.handle_events(events) for session, events in routed.items()}
+
+    def render(self) -> None:
+        for session in self.sessions:
+            session.profile_lap("station")
+            session.draw_frame()
+        pygame.display.flip()
+        for session in self.sessions:
+            session.timer.on_present()
+            session.profile_lap("display_flip")
+
+    def begin_frame(self) -> None:
+        for session in self.sessions:
+            if session.profiler is not None:
+                session.profiler.begin_frame()
+
+    def end_frame(self, active: bool) -> None:
+        for session in self.sessions:
+            session.profile_lap("frame_wait", wait=True)
+            if session.profiler is not None:
+                session.profiler.end_frame(idle=not active)
+            if session.memory is not None:
+                session.memory.end_frame()
+
+    async def run(self) -> None:
+        for session in self.sessions:
+            if session.collector is not None:
+                session.collector.start()
+        while self.running and any(session.running for session in self.sessions):
+            self.begin_frame()
+            had_events = any(self.dispatch().values())
+            for session in self.sessions:
+                session.profile_lap("handle_events")
+                if session.running:
+                    session.update()
+            active = any(session.is_animating() for session in self.sessions if session.running)
+            if self.scheduler.should_render(active, had_events):
+                self.render()
+            await self.scheduler.wait(active)
+            self.end_frame(active)
+        for session in self.sessions:
+            if session.collector is not None:
+                await session.collector.close()
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        for session in reversed(self.sessions):
+            session.shutdown()
+        pygame.quit()
+
+def main():
+    parser = argparse.ArgumentParser(description="Run several Stroop Test sessions on one display")
+    parser.add_argument("--sessions", type=int, default=2)
+    args = parser.parse_args()
+
+    station = Station(args.sessions)
+    if platform.system() == "Emscripten":
+        asyncio.ensure_future(station.run())
+    else:
+        asyncio.run(station.run())
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
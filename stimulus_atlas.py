@@ -0,0 +1,49 @@
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+import pygame
+
+class StimulusAtlas:
+    def __init__(self, font: pygame.font.Font, palette: Mapping[str, Tuple[int, int, int]],
+                 color_name: Callable[[str], str], square_size: int, language: str = "",
+                 max_width: int = 2048):
+        self.font = font
+        self.palette = palette
+        self.language = language
+        self.square_size = square_size
+        self.words: Dict[Tuple[str, str], pygame.Rect] = {}
+        self.squares: Dict[str, pygame.Rect] = {}
+
+        pieces: List[Tuple[Tuple, pygame.Surface]] = []
+        for word_key in palette:
+            text = color_name(word_key)
+            for ink_name, ink in palette.items():
+                pieces.append((("word", word_key, ink_name), font.render(text, True, ink)))
+        rects = self._pack([surface.get_size() for _, surface in pieces] +
+                           [(square_size, square_size)] * len(palette), max_width)
+        width = max((rect.right for rect in rects), default=1)
+        height = max((rect.bottom for rect in rects), default=1)
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+
+        for ((_, word_key, ink_name), surface), rect in zip(pieces, rects):
+            self.surface.blit(surface, rect, special_flags=pygame.BLEND_RGBA_MAX)
+            self.words[(word_key, ink_name)] = rect
+        for (name, color), rect in zip(palette.items(), rects[len(pieces):]):
+            self.surface.fill(color, rect)
+            self.squares[name] = rect
+
+    @staticmethod
+    def _pack(sizes: List[Tuple[int, int]], max_width: int) -> List[pygame.Rect]:
+        rects = []
+        x = y = shelf_height = 0
+        for width, height in sizes:
+            if x + width > max_width and x > 0:
+                x, y, shelf_height = 0, y + shelf_height, 0
+            rects.append(pygame.Rect(x, y, width, height))
+            x += width
+            shelf_height = max(shelf_height, height)
+        return rects
+
+    def word(self, word_key: str, ink: str) -> Optional[pygame.Rect]:
+        return self.words.get((word_key, ink))
+
+    def square(self, color_name: str) -> Optional[pygame.Rect]:
+        return self.squares.get(color_name)
\ No newline at end of file
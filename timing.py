@@ -0,0 +1,31 @@
+import time
+from typing import Optional
+import pygame
+
+class ReactionTimer:
+    def __init__(self):
+        self.onset_ns: Optional[int] = None
+        self.response_ns: Optional[int] = None
+        self._onset_pending = False
+
+    def arm(self) -> None:
+        self.onset_ns = None
+        self._onset_pending = True
+
+    def on_present(self) -> None:
+        if self._onset_pending:
+            self.onset_ns = time.perf_counter_ns()
+            self._onset_pending = False
+
+    def stamp(self, event: pygame.event.Event) -> int:
+        now_ns = time.perf_counter_ns()
+        timestamp = getattr(event, "timestamp", None)
+        if timestamp is not None:
+            now_ns -= max(0, pygame.time.get_ticks() - timestamp) * 1_000_000
+        self.response_ns = now_ns
+        return now_ns
+
+    def reaction_time(self) -> Optional[float]:
+        if self.onset_ns is None or self.response_ns is None or self.response_ns < self.onset_ns:
+            return None
+        return (self.response_ns - self.onset_ns) / 1e9
\ No newline at end of file
@@ -0,0 +1,277 @@
+import hashlib
+import json
+import marshal
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple
+from config_writer import DebouncedJsonWriter
+
+CompiledLanguage = Tuple[Dict[str, str], Dict[str, str]]
+CACHE_FORMAT = [1, marshal.version, *sys.version_info[:2]]
+
+def compile_language(language: str, translations: Any) -> CompiledLanguage:
+    if not isinstance(translations, dict):
+        print(f"Warning: Missing translations for language '{language}'")
+        translations = {}
+    text_table = {key: value for key, value in translations.items() if isinstance(value, str)}
+    colors = translations.get("colors")
+    if not isinstance(colors, dict):
+        print(f"Warning: Missing color translations in language '{language}'")
+        colors = {}
+    return text_table, dict(colors)
+
+def expand_language(compiled: CompiledLanguage) -> Dict[str, Any]:
+    text_table, color_name_table = compiled
+    return dict(text_table, colors=dict(color_name_table))
+
+class TranslationWriter(DebouncedJsonWriter):
+    def __init__(self, store: 'TranslationStore', delay: float):
+        super().__init__(store.source, delay)
+        self.store = store
+
+    def _write(self, data: Dict[str, Any]) -> None:
+        if self.store.write_source(data):
+            self.writes += 1
+
+class TranslationStore:
+    def __init__(self, source: Path = Path("translations.json"),
+                 defaults: Optional[Dict[str, Dict[str, Any]]] = None,
+                 cache_dir: Optional[Path] = None, write_delay: float = 0.5):
+        self.source = Path(source)
+        self.cache_dir = Path(cache_dir) if cache_dir else self.source.with_name(f".{self.source.stem}_cache")
+        self.defaults = defaults or {}
+        self.writer = TranslationWriter(self, write_delay)
+        self.compiles = 0
+        self.cache_loads = 0
+        self._lock = threading.RLock()
+        self._languages: Dict[str, CompiledLanguage] = {}
+        self._files: Dict[str, str] = {}
+        self._raw: Optional[Dict[str, Any]] = None
+        self._cached = False
+        self._validated = False
+        self._revisions: Dict[str, int] = {}
+        self._written: Dict[str, int] = {}
+
+    @property
+    def index_path(self) -> Path:
+        return self.cache_dir / "index.json"
+
+    def _read_index(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("format") == CACHE_FORMAT and isinstance(index.get("languages"), dict):
+                return index
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Warning: Ignoring translation cache index: {e}")
+        return None
+
+    def _write_index(self, stat: os.stat_result, digest: str) -> None:
+        temp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"format": CACHE_FORMAT, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size,
+                       "sha1": digest, "languages": self._files}, f)
+        os.replace(temp_path, self.index_path)
+
+    def _cache_file(self, language: str) -> str:
+        return hashlib.sha1(language.encode("utf-8")).hexdigest()[:16] + ".marshal"
+
+    def _write_cache(self, language: str, compiled: CompiledLanguage) -> None:
+        name = self._cache_file(language)
+        temp_path = self.cache_dir / (name + ".tmp")
+        with open(temp_path, "wb") as f:
+            marshal.dump(compiled, f)
+        os.replace(temp_path, self.cache_dir / name)
+        self._files[language] = name
+
+    def validate(self) -> None:
+        with self._lock:
+            self._languages.clear()
+            self._files = {}
+            self._raw = None
+            self._cached = False
+            self._validated = True
+            try:
+                stat = os.stat(self.source)
+            except FileNotFoundError:
+                return
+            except Exception as e:
+                print(f"Warning: Could not load translations from file: {e}")
+                return
+
+            index = self._read_index()
+            if index and index.get("mtime_ns") == stat.st_mtime_ns and index.get("size") == stat.st_size:
+                self._files = dict(index["languages"])
+                self._cached = True
+                return
+
+            try:
+                with open(self.source, "rb") as f:
+                    content = f.read()
+            except Exception as e:
+                print(f"Warning: Could not load translations from file: {e}")
+                return
+            digest = hashlib.sha1(content).hexdigest()
+            if index and index.get("sha1") == digest:
+                self._files = dict(index["languages"])
+                self._cached = True
+                try:
+                    self._write_index(stat, digest)
+                except Exception as e:
+                    print(f"Warning: Could not update translation cache: {e}")
+                return
+            self._compile_source(content, stat, digest)
+
+    def _compile_source(self, content: bytes, stat: os.stat_result, digest: str) -> None:
+        try:
+            raw = json.loads(content.decode("utf-8"))
+            if not isinstance(raw, dict):
+                raise ValueError("translations file must contain a JSON object")
+        except Exception as e:
+            print(f"Warning: Could not load translations from file: {e}")
+            return
+        self._raw = raw
+        self.compiles += 1
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for language, translations in raw.items():
+                self._write_cache(language, compile_language(language, translations))
+            self._write_index(stat, digest)
+            self._cached = True
+        except Exception as e:
+            print(f"Warning: Could not write translation cache: {e}")
+
+    def _source(self) -> Dict[str, Any]:
+        if self._raw is not None:
+            return self._raw
+        if self._files:
+            return {language: None for language in self._files}
+        return self.defaults
+
+    def languages(self) -> Set[str]:
+        with self._lock:
+            if not self._validated:
+                self.validate()
+            return set(self._languages) | set(self._source())
+
+    def language(self, language: str) -> Optional[CompiledLanguage]:
+        with self._lock:
+            if not self._validated:
+                self.validate()
+            compiled = self._languages.get(language)
+            if compiled is not None:
+                return compiled
+            source = self._source()
+            if language not in source:
+                return None
+            if self._raw is None and self._cached:
+                try:
+                    with open(self.cache_dir / self._files[language], "rb") as f:
+                        compiled = marshal.load(f)
+                    self.cache_loads += 1
+                    self._languages[language] = compiled
+                    return compiled
+                except Exception as e:
+                    print(f"Warning: Rebuilding translation cache: {e}")
+                    self._recompile()
+                    source = self._source()
+                    if language not in source:
+                        return None
+            compiled = compile_language(language, source[language])
+            self._languages[language] = compiled
+            return compiled
+
+    def _recompile(self) -> None:
+        self._files = {}
+        self._cached = False
+        try:
+            stat = os.stat(self.source)
+            with open(self.source, "rb") as f:
+                content = f.read()
+        except Exception as e:
+            print(f"Warning: Could not load translations from file: {e}")
+            return
+        self._compile_source(content, stat, hashlib.sha1(content).hexdigest())
+        if self._raw is None:
+            self._files = {}
+
+    def update(self, language: str, translations: Dict[str, Any]) -> CompiledLanguage:
+        with self._lock:
+            self._load_all()
+            compiled = compile_language(language, translations)
+            self._languages[language] = compiled
+            self._touch(language)
+            self._schedule()
+            return compiled
+
+    def add_color_name(self, color: str) -> None:
+        with self._lock:
+            changed = False
+            for language in sorted(self.languages()):
+                color_name_table = self.language(language)[1]
+                if color not in color_name_table:
+                    color_name_table[color] = color
+                    self._touch(language)
+                    changed = True
+            if changed:
+                self._schedule()
+
+    def _touch(self, language: str) -> None:
+        self._revisions[language] = self._revisions.get(language, 0) + 1
+
+    def _load_all(self) -> None:
+        for language in self.languages():
+            self.language(language)
+
+    def _schedule(self) -> None:
+        self._load_all()
+        self.writer.schedule({
+            "translations": {language: expand_language(self._languages[language])
+                             for language in sorted(self._languages)},
+            "revisions": dict(self._revisions)
+        })
+
+    def save(self) -> None:
+        with self._lock:
+            for language in self.languages():
+                self._touch(language)
+            self._schedule()
+        self.flush()
+
+    def flush(self) -> None:
+        self.writer.flush()
+
+    def write_source(self, payload: Dict[str, Any]) -> bool:
+        data, revisions = payload["translations"], payload["revisions"]
+        temp_path = self.source.with_name(self.source.name + ".tmp")
+        try:
+            content = json.dumps(data, ensure_ascii=False, indent=4).encode("utf-8")
+            with open(temp_path, "wb") as f:
+                f.write(content)
+            os.replace(temp_path, self.source)
+            stat = os.stat(self.source)
+        except Exception as e:
+            print(f"Warning: Could not save translations to file: {e}")
+            return False
+
+        with self._lock:
+            rebuild = [language for language in sorted(data) if not self._cached or language not in self._files
+                       or revisions.get(language, 0) > self._written.get(language, 0)]
+            self._raw = None
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                self._files = {language: name for language, name in self._files.items() if language in data}
+                for language in rebuild:
+                    self._write_cache(language, compile_language(language, data[language]))
+                    self._written[language] = max(self._written.get(language, 0), revisions.get(language, 0))
+                self._write_index(stat, hashlib.sha1(content).hexdigest())
+                self._cached = True
+            except Exception as e:
+                print(f"Warning: Could not write translation cache: {e}")
+                self._cached = False
+                self._raw = data
+        return True
\ No newline at end of file
@@ -0,0 +1,129 @@
+import json
+import mmap
+import platform
+import queue
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+MAGIC = b"STRP"
+VERSION = 1
+HEADER = struct.Struct("<4sHI")
+RECORD = struct.Struct("<B?hhhhqq")
+
+class TrialRecord(NamedTuple):
+    part: int
+    is_correct: bool
+    word: int
+    ink: int
+    correct: int
+    response: int
+    onset_ns: int
+    response_ns: int
+
+class TrialLogWriter:
+    def __init__(self, directory: str = "results", buffer_records: int = 256):
+        self.directory = Path(directory)
+        self.buffer_records = buffer_records
+        self._buffer = bytearray(RECORD.size * buffer_records)
+        self._count = 0
+        self._path: Optional[Path] = None
+        self._color_index: Dict[str, int] = {}
+        self._threaded = platform.system() != "Emscripten"
+        self._queue: "queue.Queue[Optional[Tuple[Path, bytes]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def path(self) -> Optional[Path]:
+        return self._path
+
+    def begin_session(self, metadata: Dict[str, Any]) -> Path:
+        self.end_session()
+        colors = list(metadata.get("colors", []))
+        self._color_index = {name: i for i, name in enumerate(colors)}
+        header = json.dumps(dict(metadata, colors=colors), ensure_ascii=False).encode("utf-8")
+        self._path = self.directory / f"session-{time.strftime('%Y%m%d-%H%M%S')}-{time.time_ns() % 1_000_000_000:09d}.strp"
+        self._submit(self._path, HEADER.pack(MAGIC, VERSION, len(header)) + header)
+        return self._path
+
+    def record(self, part: int, word: str, ink: str, correct: str, response: str,
+               onset_ns: int, response_ns: int, is_correct: bool) -> None:
+        if self._path is None:
+            return
+        index = self._color_index.get
+        RECORD.pack_into(self._buffer, self._count * RECORD.size, part, is_correct,
+                         index(word, -1), index(ink, -1), index(correct, -1), index(response, -1),
+                         onset_ns, response_ns)
+        self._count += 1
+        if self._count == self.buffer_records:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._path is None or self._count == 0:
+            return
+        data = bytes(self._buffer[:self._count * RECORD.size])
+        self._count = 0
+        self._submit(self._path, data)
+
+    def end_session(self) -> None:
+        self.flush()
+        self._path = None
+
+    def close(self) -> None:
+        self.end_session()
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _submit(self, path: Path, data: bytes) -> None:
+        if not self._threaded:
+            self._append(path, data)
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name="trial-log-writer", daemon=True)
+            self._thread.start()
+        self._queue.put((path, data))
+
+    def _worker(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            self._append(*item)
+
+    def _append(self, path: Path, data: bytes) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "ab") as f:
+                f.write(data)
+        except Exception as e:
+            print(f"Error writing trial log: {e}")
+
+class SessionLog:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            magic, version, header_len = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{self.path} is not a trial log")
+            if version != VERSION:
+                raise ValueError(f"Unsupported trial log version {version} in {self.path}")
+            self.metadata: Dict[str, Any] = json.loads(f.read(header_len).decode("utf-8"))
+        self.data_offset = HEADER.size + header_len
+        self.colors: List[str] = self.metadata.get("colors", [])
+
+    def records(self) -> Iterator[TrialRecord]:
+        with open(self.path, "rb") as f:
+            size = f.seek(0, 2)
+            if size <= self.data_offset:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                end = self.data_offset + (size - self.data_offset) // RECORD.size * RECORD.size
+                for fields in RECORD.iter_unpack(data[self.data_offset:end]):
+                    yield TrialRecord(*fields)
+
+    def color_name(self, index: int) -> str:
+        return self.colors[index] if 0 <= index < len(self.colors) else ""
\ No newline at end of file
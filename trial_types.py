@@ -0,0 +1,83 @@
+import random
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import pygame
+    from stimulus_atlas import StimulusAtlas
+
+Stimuli = Tuple[List[str], List[str], List[Tuple[float, float]]]
+Stimulus = Tuple['pygame.Surface', Optional['pygame.Rect']]
+
+@dataclass
+class RenderPlan:
+    surface: Optional['pygame.Surface']
+    area: Optional['pygame.Rect']
+    rect: Optional['pygame.Rect']
+    signature: Tuple[str, str]
+    correct: str
+
+class TrialType(ABC):
+    name = ""
+
+    @abstractmethod
+    def generate(self, schedule, rng: random.Random, targets: List[str]) -> Stimuli:
+        pass
+
+    def stimulus(self, atlas: 'StimulusAtlas', word_key: str, ink: str) -> Optional[Stimulus]:
+        region = atlas.word(word_key, ink)
+        return (atlas.surface, region) if region is not None else None
+
+    def compile(self, atlas: 'StimulusAtlas', word_key: str, ink: str, correct: str,
+                center: Tuple[float, float]) -> RenderPlan:
+        stimulus = self.stimulus(atlas, word_key, ink)
+        if stimulus is None:
+            return RenderPlan(None, None, None, (word_key, ink), correct)
+        surface, area = stimulus
+        rect = area.copy() if area is not None else surface.get_rect()
+        rect.center = center
+        return RenderPlan(surface, area, rect, (word_key, ink), correct)
+
+class WordReadingTrial(TrialType):
+    name = "word_reading"
+
+    def generate(self, schedule, rng: random.Random, targets: List[str]) -> Stimuli:
+        return targets, schedule.draw_distractors(rng, targets), [(0.5, 0.5)] * len(targets)
+
+class ColorNamingTrial(TrialType):
+    name = "color_naming"
+
+    def generate(self, schedule, rng: random.Random, targets: List[str]) -> Stimuli:
+        return [""] * len(targets), targets, schedule.draw_positions(rng)
+
+    def stimulus(self, atlas: 'StimulusAtlas', word_key: str, ink: str) -> Optional[Stimulus]:
+        region = atlas.square(ink)
+        return (atlas.surface, region) if region is not None else None
+
+class InkNamingTrial(TrialType):
+    name = "ink_naming"
+
+    def generate(self, schedule, rng: random.Random, targets: List[str]) -> Stimuli:
+        return schedule.draw_distractors(rng, targets), targets, schedule.draw_positions(rng)
+
+TRIAL_TYPES: Dict[str, TrialType] = {}
+DEFAULT_TRIAL_TYPES = ("word_reading", "color_naming", "ink_naming")
+
+def register_trial_type(trial_type: TrialType) -> TrialType:
+    if not trial_type.name:
+        raise ValueError("Trial types need a name")
+    TRIAL_TYPES[trial_type.name] = trial_type
+    return trial_type
+
+def get_trial_type(name: str) -> TrialType:
+    trial_type = TRIAL_TYPES.get(name)
+    if trial_type is None:
+        raise ValueError(f"Unknown trial type '{name}'. Registered trial types are: {', '.join(sorted(TRIAL_TYPES))}")
+    return trial_type
+
+def resolve_trial_types(names: Sequence[str]) -> List[TrialType]:
+    return [get_trial_type(name) for name in names]
+
+for trial_type in (WordReadingTrial(), ColorNamingTrial(), InkNamingTrial()):
+    register_trial_type(trial_type)
\ No newline at end of file